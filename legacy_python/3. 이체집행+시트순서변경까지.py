@@ -1,12 +1,8 @@
+import atexit
 import subprocess
 import pyautogui
 import time as tm
-import cv2
-import numpy as np
-import mss
 import os   
-import pandas as pd
-import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -15,14 +11,41 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
+from image_locator import ImageLocator, LocationHints, MatchTelemetry, TemplateRegistry
+from image_locator import MATCH_THRESHOLD, learn_thresholds, load_telemetry
+from image_locator import match_template as match_template_array
+from screen_sources import CaptureSession
+from cdp_input import is_transkey_field, type_with_cdp
+from transfer_page import ACCOUNT_FIELD, AMOUNT_FIELD, BANK_FIELD, MAX_ROWS, NAME_PRODUCT_FIELD, PRODUCT_FIELD
+from transfer_page import ROW_FIELDS, MultiTransferPage, bulk_fill, clear_fields, reconcile_plan
+from transfer_page import MULTI_TRANSFER_MENU, TRANSFER_MENU_XPATH, click_menu_link, scroll_into_view
+from transfer_batches import SUBMITTED, UNCONFIRMED, BatchProgress, run_batches
+from flow_timing import SleepBudget, document_ready, wait_for, wait_page_change
+from popup_dispatcher import PopupDispatcher
+from browser_session import attach_chrome, session_alive
+from browser_profile import apply_blocked_urls, record_page_timing
+from payout_data import BANK_OPTIONS, prefetch_payout_rows, prepare_payout_rows, print_payout_problems
+from transfer_result import FAILED, SUCCESS, RESULT_HEADER_XPATH, match_outcomes, parse_result_rows
+from transfer_result import save_result_snapshot, write_outcomes
+
 # 현재 스크립트의 절대 경로를 얻고, 그 디렉토리로 작업 디렉토리 변경
 script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
 
+# 이체 정보는 로그인과 동시에 백그라운드 스레드에서 읽고 검증 (문제 있는 행은 준비되는 즉시 출력)
+excel_path = os.path.join(script_dir, "이체정보.xlsx")
+bank_options = BANK_OPTIONS
+PAYOUT_PREFETCH = prefetch_payout_rows(excel_path, bank_options)
+
 # 이미지 파일 경로를 src 폴더에서 찾도록 설정
 img_dir = os.path.join(script_dir, "src")
 print("이미지 디렉토리:", img_dir)
 
+# 단계별 대기/작업 시간 기록 (종료 시 보고서를 출력하고 sleep_budget.jsonl에 추가)
+SLEEP_BUDGET = SleepBudget()
+SLEEP_BUDGET_PATH = os.path.join(script_dir, "sleep_budget.jsonl")
+atexit.register(SLEEP_BUDGET.dump, SLEEP_BUDGET_PATH)
+
 # 사용자에게 다계좌이체진행 여부를 묻기
 user_input = input("🟠다계좌이체진행(자동)을 함께 진행할까요? (y/n): ")
 auto_transfer = user_input.lower() == 'y'
@@ -57,60 +80,84 @@ def get_image_path(image_name):
     path = os.path.join(img_dir, image_name)
     return os.path.normpath(path)
 
+# Windows 배율(125%, 150%)이나 브라우저 확대에 대비해 미리 만들어 둘 템플릿 배율
+TEMPLATE_SCALES = (1.0, 1.25, 1.5)
+
+# 시작 시 템플릿 이미지를 한 번만 디코딩
+# (build_template_pack.py로 만든 템플릿 팩이 있으면 PNG 디코딩 없이 메모리 맵으로 로드)
+TEMPLATE_PACK = os.path.join(img_dir, "templates_pack.npy")
+TEMPLATES = TemplateRegistry(img_dir, COORDS, scales=TEMPLATE_SCALES, pack_path=TEMPLATE_PACK)
+
+# 캡처 세션은 한 번만 열어 계속 재사용 (screen_sources의 다른 소스로 교체 가능)
+CAPTURE = CaptureSession()
+
 # 모니터 설정 부분을 동적으로 변경
-def get_monitor_configs():
-    with mss.mss() as sct:
-        monitors = []
-        for i, monitor in enumerate(sct.monitors[1:], 1):  # monitors[0]은 전체 화면이므로 제외
-            monitors.append({
-                'top': monitor['top'],
-                'left': monitor['left'],
-                'width': monitor['width'],
-                'height': monitor['height'],
-                'number': i
-            })
-            print(f"모니터 {i} 감지됨: {monitors[-1]}")
-        return monitors
+def get_monitor_configs(source):
+    monitors = source.monitors()
+    for monitor in monitors:
+        print(f"모니터 {monitor['number']} 감지됨: {monitor}")
+    return monitors
 
 # 전역 변수로 모니터 설정
-MONITORS = get_monitor_configs()
+MONITORS = get_monitor_configs(CAPTURE)
 
 def capture_screen(region):
-    with mss.mss() as sct:
-        screenshot = sct.grab(region)
-        img = np.array(screenshot)
-        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        return img                      
+    # BGRA 버퍼를 그대로 반환 (BGR 변환 복사 없음)
+    return CAPTURE.grab_region(region)
 
 def match_template(screen, template_path):
-    # 전체 경로로 이미지 로드
-    full_path = get_image_path(template_path)
-    # cv2.imread 대신 numpy를 사용하여 이미지 로드
-    template = cv2.imdecode(np.fromfile(full_path, dtype=np.uint8), cv2.IMREAD_COLOR)
-    if template is None:
-        raise ValueError(f"이미지를 찾을 수 없습니다: {full_path}")
-
-    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-    _, max_val, _, max_loc = cv2.minMaxLoc(result)
-    if max_val >= 0.98:  # 일치율이 90% 이상인 경우
-        return (max_loc[0] + template.shape[1] // 2, max_loc[1] + template.shape[0] // 2)
-    return None
+    # 미리 디코딩된 템플릿 사용 (파일이 바뀐 경우에만 다시 로드)
+    template = TEMPLATES.get(template_path)
+    return match_template_array(screen, template)  # 일치율이 98% 이상인 경우
+
+# 템플릿별 마지막 발견 위치 (src 폴더 옆 JSON에 저장)
+LOCATE_HINTS = LocationHints(os.path.join(script_dir, "locate_hints.json"))
+# 고해상도 모니터에서는 2 또는 4로 설정하면 축소 화면에서 후보를 먼저 찾음
+LOCATE_PYRAMID = None
+# 모니터 병렬 매칭 스레드 수 (None이면 CPU 코어 수)
+LOCATE_WORKERS = None
+# 매칭 시도별 일치율 기록 (종료 시 JSONL로 저장)
+MATCH_TELEMETRY = MatchTelemetry()
+MATCH_TELEMETRY_PATH = os.path.join(script_dir, "match_telemetry.jsonl")
+atexit.register(MATCH_TELEMETRY.dump, MATCH_TELEMETRY_PATH)
+# True이면 지금까지 기록된 일치율 분포로 템플릿별 임계값을 정해 고정 0.98 대신 사용
+LEARN_THRESHOLDS = False
+# 인증서 비밀번호용 가상 키보드 버튼은 글자 모양이 서로 비슷해 잘못 누르면 인증서가 잠길 수 있으므로 낮추지 않음
+THRESHOLD_FLOORS = {
+    image: MATCH_THRESHOLD for name, image in COORDS.items() if name.startswith("key_") or name.endswith("_bt")
+}
+MATCH_THRESHOLDS = (
+    learn_thresholds(load_telemetry(MATCH_TELEMETRY_PATH), floors=THRESHOLD_FLOORS) if LEARN_THRESHOLDS else {}
+)
+if MATCH_THRESHOLDS:
+    print("템플릿별 임계값:", MATCH_THRESHOLDS)
+LOCATOR = ImageLocator(TEMPLATES, CAPTURE, MONITORS, LOCATE_HINTS,
+                       pyramid=LOCATE_PYRAMID, workers=LOCATE_WORKERS,
+                       telemetry=MATCH_TELEMETRY, thresholds=MATCH_THRESHOLDS)
+# True이면 고정 1초 재시도 대신 화면이 바뀔 때만 다시 매칭 (약 50ms 간격으로 변화 감시)
+LOCATE_WATCH = True
+LOCATE_POLL_INTERVAL = 0.05
+
+# 클릭 후 화면이 SETTLE_QUIET초 동안 변하지 않으면 안정된 것으로 판단 (최대 SETTLE_TIMEOUT초)
+SETTLE_QUIET = 0.3
+SETTLE_TIMEOUT = 5
+
+def wait_screen_settle(location=None, quiet=SETTLE_QUIET, timeout=SETTLE_TIMEOUT):
+    """클릭한 모니터(없으면 전체 모니터)의 화면이 안정될 때까지 기다립니다."""
+    region = LOCATOR.monitor_at(location) if location else None
+    elapsed = LOCATOR.wait_settle(region, quiet=quiet, timeout=timeout)
+    SLEEP_BUDGET.add_wait("screen_settle", elapsed)
+    print(f"화면 안정화까지 {elapsed:.2f}초 걸렸습니다.")
+    return elapsed
 
 def locate_image_on_monitors(image_path):
     """모든 감지된 모니터에서 이미지를 찾습니다."""
-    for monitor in MONITORS:
-        location = locate_image_on_monitor(image_path, monitor)
-        if location:
-            return location
-    return None
+    # 마지막 위치 주변 → 마지막 모니터 → 전체 데스크톱 순서로 탐색
+    return LOCATOR.locate(image_path)
     
-def locate_image_on_monitor(image_path, monitor):
+def locate_image_on_monitor(image_path, monitor, frame=None):
     """단일 모니터에서 이미지를 찾습니다."""
-    screen = capture_screen(monitor)
-    location = match_template(screen, image_path)
-    if location:
-        location = (location[0] + monitor['left'], location[1] + monitor['top'])
-    return location
+    return LOCATOR.locate_on_monitor(image_path, monitor, frame)
 
 def locate_and_click(image_name):
     image_path = COORDS[image_name]  # 이미지 파일명 가져오기
@@ -118,12 +165,24 @@ def locate_and_click(image_name):
     
     # 최대 20회 재시도
     max_attempts = 20
+    if LOCATE_WATCH:
+        # 20초 동안 화면 변화를 감시하며 대기
+        with SLEEP_BUDGET.waiting("image"):
+            location = LOCATOR.wait_for(image_path, timeout=max_attempts, poll_interval=LOCATE_POLL_INTERVAL)
+        if location:
+            print(f"{image_path}의 위치를 찾았습니다: {location}, 클릭합니다.")
+            pyautogui.click(location)
+            wait_screen_settle(location)
+            return True
+        print(f"{image_path}의 위치를 찾을 수 없습니다. 최대 대기 시간 초과.")
+        return False
+
     for attempt in range(max_attempts):
         location = locate_image_on_monitors(image_path)
         if location:
             print(f"{image_path}의 위치를 찾았습니다: {location}, 클릭합니다.")
             pyautogui.click(location)
-            tm.sleep(1)
+            wait_screen_settle(location)
             return True
         else:
             if attempt < max_attempts - 1:  # 마지막 시도가 아니면
@@ -133,17 +192,49 @@ def locate_and_click(image_name):
                 print(f"{image_path}의 위치를 찾을 수 없습니다. 최대 시도 횟수 초과.")
                 return False
 
+def locate_many(image_names, max_age_ms=0):
+    """한 번의 캡처로 여러 이미지의 위치를 찾아 {이름: 위치}로 반환합니다."""
+    locations = LOCATOR.locate_many([COORDS[name] for name in image_names], max_age_ms)
+    return {name: locations[COORDS[name]] for name in image_names}
+
+def click_sequence(image_names, interval=0.1):
+    """모든 대상 위치를 한 번에 찾은 뒤 순서대로 클릭합니다."""
+    locations = locate_many(image_names)
+    for name in image_names:
+        location = locations.get(name)
+        if location:
+            print(f"{COORDS[name]}의 위치를 찾았습니다: {location}, 클릭합니다.")
+            pyautogui.click(location)
+            wait_screen_settle(location)
+        else:
+            # 한 번에 찾지 못한 대상은 기존 방식으로 재시도
+            locate_and_click(name)
+        tm.sleep(interval)
+
 def locate_and_click_with_retry(image_name, max_retries=30, retry_interval=1):
     """이미지를 찾고 클릭하는 함수 (재시도 로직 포함)"""
     image_path = COORDS[image_name]  # 이미지 파일명 가져오기
     print(f"{image_path}을(를) 찾고 클릭합니다.")
     
+    if LOCATE_WATCH:
+        # max_retries * retry_interval 동안 화면 변화를 감시하며 대기
+        timeout = max_retries * retry_interval
+        with SLEEP_BUDGET.waiting("image"):
+            location = LOCATOR.wait_for(image_path, timeout=timeout, poll_interval=LOCATE_POLL_INTERVAL)
+        if location:
+            print(f"{image_path}의 위치를 찾았습니다: {location}, 클릭합니다.")
+            pyautogui.click(location)
+            wait_screen_settle(location)
+            return True
+        print(f"{image_path}을(를) {timeout}초 동안 찾을 수 없었습니다.")
+        return False
+
     for attempt in range(max_retries):
         location = locate_image_on_monitors(image_path)
         if location:
             print(f"{image_path}의 위치를 찾았습니다: {location}, 클릭합니다. (시도 {attempt+1}/{max_retries})")
             pyautogui.click(location)
-            tm.sleep(1)
+            wait_screen_settle(location)
             return True
         else:
             print(f"{image_path}의 위치를 찾을 수 없습니다. (시도 {attempt+1}/{max_retries})")
@@ -153,53 +244,166 @@ def locate_and_click_with_retry(image_name, max_retries=30, retry_interval=1):
     print(f"{image_path}을(를) {max_retries}초 동안 찾을 수 없었습니다.")
     return False
 
+# 조건 대기별 최대 시간(초). 조건이 먼저 만족되면 즉시 진행
+WAIT_TIMEOUTS = {
+    "cert_login": 30,      # 공동인증서 로그인 버튼
+    "main_frame": 60,      # 로그인 후 hanaMainframe
+    "transfer_menu": 20,   # '이체' 메뉴 링크
+    "page_change": 3,      # 메뉴 클릭 후 이전 화면이 사라질 때까지
+    "page_ready": 20,      # document.readyState == 'complete'
+    "multi_transfer": 20,  # 다계좌이체 입력 화면 (첫 행 은행 선택)
+    "submit": 10,          # 다계좌이체진행 버튼 클릭 가능
+    "result": 30,          # 이체 후 결과 표
+}
+
+def wait_until(condition, name):
+    """WAIT_TIMEOUTS[name]초 동안 condition을 기다립니다. 대기 시간은 SLEEP_BUDGET에 기록됩니다."""
+    return wait_for(driver, condition, WAIT_TIMEOUTS[name], SLEEP_BUDGET, name)
+
+def wait_menu_loaded(link):
+    """메뉴 링크 클릭 후 화면 전환과 문서 로드 완료를 기다립니다."""
+    wait_page_change(driver, link, WAIT_TIMEOUTS["page_change"], WAIT_TIMEOUTS["page_ready"],
+                     SLEEP_BUDGET, "page_change")
+
+def wait_multi_transfer_form():
+    """다계좌이체 입력 화면의 첫 행 은행 선택이 나타날 때까지 기다립니다."""
+    return wait_until(EC.presence_of_element_located((By.ID, f"{BANK_FIELD}0")), "multi_transfer")
+
+frame_id = "hanaMainframe"  # 프레임 ID를 여기에 입력하세요
+
+# 현재 다계좌이체 화면에서 다계좌이체진행 버튼을 눌렀는지 (누른 화면은 다시 쓰지 않음)
+TRANSFER_SUBMITTED = False
+
+def multi_transfer_form_open():
+    """이체하지 않은 다계좌이체 입력 화면이 열려 있으면 그 프레임으로 전환하고 True를 반환합니다."""
+    if TRANSFER_SUBMITTED:
+        return False
+    driver.switch_to.default_content()
+    frames = driver.find_elements(By.ID, frame_id)
+    if not frames:
+        return False
+    driver.switch_to.frame(frames[0])
+    return bool(driver.find_elements(By.ID, f"{BANK_FIELD}0"))
+
+def open_multi_transfer_page():
+    """hanaMainframe에서 메뉴 링크로 다계좌이체 화면을 열고 첫 행 은행 선택이 나타날 때까지 기다립니다."""
+    global TRANSFER_SUBMITTED
+    TRANSFER_SUBMITTED = False
+    SLEEP_BUDGET.mark("다계좌이체 화면")
+    driver.switch_to.default_content()  # 기본 프레임으로 돌아가기
+    wait_until(EC.frame_to_be_available_and_switch_to_it(frame_id), "main_frame")
+    # 이미 다계좌이체 화면이면 새로 열린 것을 확인할 수 있도록 기존 입력 요소를 기억
+    previous_form = driver.find_elements(By.ID, f"{BANK_FIELD}0")
+
+    # 메뉴의 다계좌이체 링크(숨은 하위 메뉴 포함)를 바로 실행하고, 없으면 '이체' 메뉴를 연 뒤 다시 시도
+    if click_menu_link(driver, MULTI_TRANSFER_MENU):
+        print("메뉴에서 다계좌이체 링크를 실행했습니다.")
+    else:
+        try:
+            transfer_link = wait_until(EC.element_to_be_clickable((By.XPATH, TRANSFER_MENU_XPATH)), "transfer_menu")
+            transfer_link.click()
+            print("'이체' 메뉴 링크를 클릭했습니다.")
+            wait_menu_loaded(transfer_link)
+        except TimeoutException:
+            print("'이체' 메뉴 링크를 찾지 못해 이미지 인식으로 이체 탭을 클릭합니다.")
+            locate_and_click("send_tab")
+            wait_until(document_ready, "page_ready")
+        try:
+            wait_until(lambda d: click_menu_link(d, MULTI_TRANSFER_MENU), "transfer_menu")
+            print("이체 화면에서 다계좌이체 링크를 실행했습니다.")
+        except TimeoutException:
+            print("다계좌이체 링크를 찾지 못해 이미지 인식으로 클릭합니다.")
+            locate_and_click("multisend")
+
+    if previous_form:
+        wait_until(EC.staleness_of(previous_form[0]), "multi_transfer")
+    bank_select = wait_multi_transfer_form()
+    wait_until(document_ready, "page_ready")
+    record_page_timing(driver, "multi_transfer", LEAN_PROFILE, PAGE_TIMINGS_PATH)
+    scroll_into_view(driver, bank_select)
+    print("다계좌이체 화면을 열었습니다.")
+    return bank_select
+
+# True이면 원격 디버깅 포트로 이전 실행의 Chrome(전용 프로필)에 붙고,
+# 하나은행 로그인 세션이 살아 있으면 인증서 로그인을 건너뜀
+# 주의: 스크립트가 끝나도 로그인된 Chrome이 디버깅 포트를 연 채 남습니다. 이 PC의 다른 프로그램이
+# 포트에 붙으면 인증 없이 은행 세션을 조작할 수 있으므로, 쓰고 나면 반드시 Chrome을 닫거나 로그아웃하세요.
+REUSE_SESSION = False
+CHROME_DEBUG_PORT = 9222
+CHROME_PROFILE_DIR = os.path.join(script_dir, "chrome_profile")
+
+# True이면 광고/추적/배너 리소스를 막는 가벼운 설정 사용 (인증서/보안 프로그램 리소스는 막지 않음)
+LEAN_PROFILE = True
+# 화면 로드 시간 기록 (python browser_profile.py page_timings.jsonl 로 설정 사용/미사용 비교)
+PAGE_TIMINGS_PATH = os.path.join(script_dir, "page_timings.jsonl")
+
 # Selenium 설정 및 웹페이지 열기
+SLEEP_BUDGET.mark("브라우저 연결")
 url = 'https://www.kebhana.com/common/login.do'
-options = Options()
-options.add_experimental_option("detach", True)
-options.add_argument("--disable-blink-features=AutomationControlled")
+if REUSE_SESSION:
+    chrome_args = ["--disable-blink-features=AutomationControlled"]
+    if LEAN_PROFILE:
+        chrome_args.append("--disable-notifications")
+    driver, chrome_launched = attach_chrome(CHROME_DEBUG_PORT, CHROME_PROFILE_DIR, extra_args=chrome_args)
+    SESSION_REUSED = not chrome_launched and session_alive(driver, "hanaMainframe")
+else:
+    options = Options()
+    options.add_experimental_option("detach", True)
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    if LEAN_PROFILE:
+        options.add_argument("--disable-notifications")
 
-driver = webdriver.Chrome(options=options)
-driver.get(url)
+    driver = webdriver.Chrome(options=options)
+    SESSION_REUSED = False
+
+if LEAN_PROFILE:
+    # 차단 목록은 현재 탭에 적용되므로 세션 확인으로 탭을 고른 뒤 적용
+    blocked_urls = apply_blocked_urls(driver)
+    print(f"리소스 차단 패턴 {len(blocked_urls)}개를 적용했습니다.")
+
+def open_certificate_login():
+    """로그인 페이지를 열고 공동인증서 로그인 버튼을 누릅니다."""
+    driver.get(url)
+    record_page_timing(driver, "login", LEAN_PROFILE, PAGE_TIMINGS_PATH)
 
-try:
-    # 최대 30초 동안 대기하되, 요소가 나타나면 즉시 진행
-    wait = WebDriverWait(driver, 30)
-    
-    # 먼저 "공동/금융인증서 로그인" 메뉴 클릭
     try:
-        # 공동/금융인증서 로그인 메뉴 찾기 및 클릭
-        cert_menu_element = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '공동/금융인증서 로그인')]")))
-        cert_menu_element.click()
-        print("공동/금융인증서 로그인 메뉴 클릭 성공")
-        tm.sleep(3)  # 3초 대기
-    except Exception as e:
-        print(f"공동/금융인증서 로그인 메뉴 클릭 실패: {e}")
-    
-    # 기존 공동인증서 로그인 버튼 클릭
-    cert_login_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#certLogin")))
-    print(cert_login_element.text)
+        # 최대 30초 동안 대기하되, 요소가 나타나면 즉시 진행
+        wait = WebDriverWait(driver, 30)
     
-    # 클릭 시도와 재시도 로직
-    max_attempts = 60  # 최대 시도 횟수
-    for attempt in range(max_attempts):
+        # 먼저 "공동/금융인증서 로그인" 메뉴 클릭
         try:
-            # JavaScript로 클릭 시도 (더 안정적)
-            driver.execute_script("arguments[0].click();", cert_login_element)
-            print("공동인증서 로그인 버튼 클릭 성공")
-            break  # 성공하면 반복문 종료
+            # 공동/금융인증서 로그인 메뉴 찾기 및 클릭
+            cert_menu_element = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '공동/금융인증서 로그인')]")))
+            cert_menu_element.click()
+            print("공동/금융인증서 로그인 메뉴 클릭 성공")
         except Exception as e:
-            if attempt < max_attempts - 1:  # 마지막 시도가 아니면
-                print(f"클릭 실패, 1초 후 재시도합니다. ({attempt+1}/{max_attempts})")
-                tm.sleep(1)  # 1초 대기 후 재시도
-            else:
-                print(f"최대 시도 횟수 초과: {e}")
-                raise  # 재시도 모두 실패 시 예외 발생
-except TimeoutException:
-    print("certLogin 버튼을 찾을 수 없습니다.")
-    driver.quit()
+            print(f"공동/금융인증서 로그인 메뉴 클릭 실패: {e}")
+    
+        # 기존 공동인증서 로그인 버튼 클릭
+        # 로그인 방식 화면이 바뀌어 버튼을 누를 수 있게 될 때까지 대기
+        cert_login_element = wait_until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#certLogin")), "cert_login")
+        print(cert_login_element.text)
+    
+        # 클릭 시도와 재시도 로직
+        max_attempts = 60  # 최대 시도 횟수
+        for attempt in range(max_attempts):
+            try:
+                # JavaScript로 클릭 시도 (더 안정적)
+                driver.execute_script("arguments[0].click();", cert_login_element)
+                print("공동인증서 로그인 버튼 클릭 성공")
+                break  # 성공하면 반복문 종료
+            except Exception as e:
+                if attempt < max_attempts - 1:  # 마지막 시도가 아니면
+                    print(f"클릭 실패, 1초 후 재시도합니다. ({attempt+1}/{max_attempts})")
+                    tm.sleep(1)  # 1초 대기 후 재시도
+                else:
+                    print(f"최대 시도 횟수 초과: {e}")
+                    raise  # 재시도 모두 실패 시 예외 발생
+    except TimeoutException:
+        print("certLogin 버튼을 찾을 수 없습니다.")
+        driver.quit()
 
-tm.sleep(10)  # 이후 작업을 위한 대기 시간은 유지
+# 인증서 창은 브라우저 밖에 뜨므로 login_with_certificate에서 localdisk.png가 나타날 때까지 기다린다
 
 # PyAutoGUI를 이용한 인증서 로그인
 def login_with_certificate():
@@ -208,16 +412,16 @@ def login_with_certificate():
         print("localdisk.png를 찾을 수 없어 로그인을 중단합니다.")
         return
     
-    tm.sleep(3)
+    wait_screen_settle(quiet=1.0)
     locate_and_click("outdisktab")     # 외장하드선택
-    tm.sleep(3)     
+    wait_screen_settle(quiet=1.0)
     
     for _ in range(6):   # 탭 6번
         pyautogui.press('tab')
         tm.sleep(0.15)
     
-    # 화면 전환을 위한 대기 시간 추가
-    tm.sleep(2)  # 2초 대기0
+    # 화면 전환이 끝날 때까지 대기
+    wait_screen_settle(quiet=1.0)
     
     # shift_bt 이미지가 있는지 확인
     shift_location = locate_image_on_monitors(COORDS["shift_bt"])
@@ -225,10 +429,12 @@ def login_with_certificate():
     if shift_location:  # shift_bt가 있으면 (None이 아니면)
         # shift_bt가 있으면 마우스 클릭으로 입력
         print("마우스 클릭으로 비밀번호 입력")
+        # shift 키를 누를 때마다 키패드 배열이 바뀌므로 배열별로 나눠 한 번씩만 캡처
+        for key in ["shift_bt", "golbang_bt", "shift2_bt"]:
+            locate_and_click(key)
+            tm.sleep(0.1)  # 각 키 입력 사이에 0.1초 대기
+
         keyboard_sequence = [
-            "shift_bt",
-            "golbang_bt",
-            "shift2_bt",
             "key_g",
             "key_u",
             "key_s",
@@ -241,9 +447,7 @@ def login_with_certificate():
             "key_enter"
         ]
         
-        for key in keyboard_sequence:
-            locate_and_click(key)
-            tm.sleep(0.1)  # 각 키 입력 사이에 0.1초 대기
+        click_sequence(keyboard_sequence, interval=0.1)  # 각 키 입력 사이에 0.1초 대기
     else:
         # shift_bt가 없으면 키보드로 입력
         print("키보드로 비밀번호 입력")
@@ -254,217 +458,25 @@ def login_with_certificate():
     
     locate_and_click("commonlogin")    # 공동로그인 버튼 클릭
 
-login_with_certificate()
-tm.sleep(8)
-
-# 프레임 전환
-frame_id = "hanaMainframe"  # 프레임 ID를 여기에 입력하세요
-driver.switch_to.frame(frame_id)
-
-# 이체 메뉴 직접 클릭 (send_tab.png 대신 HTML 요소 클릭)
-try:
-    # XPath를 사용하여 "이체" 링크 찾기 (585번 라인 부근의 요소)
-    transfer_link = driver.find_element(By.XPATH, "//a[@title='이체' and text()='이체']")
-    print("'이체' 메뉴 링크를 찾았습니다.")
-    
-    # 링크 클릭
-    transfer_link.click()
-    print("'이체' 메뉴 링크를 클릭했습니다.")
-    tm.sleep(1)
-except Exception as e:
-    print(f"'이체' 메뉴 링크 클릭 중 오류 발생: {e}")
-    # 실패했을 경우 기존 방식 시도
-    print("기존 방식으로 이체 탭 클릭을 시도합니다.")                       
-    
-    locate_and_click("send_tab")
-
-tm.sleep(1)
-
-# 다계좌 이체 버튼 클릭
-for _ in range(6):   # 탭 3번
-    pyautogui.press('tab')
-
-pyautogui.press('enter')   
-tm.sleep(3)
-
-def scroll_down(amount):
-    pyautogui.scroll(-amount)  # 스크롤 다운
-
-def scroll_up(amount):
-    pyautogui.scroll(amount)  # 스크롤 업
-
-# 예시: 전체 페이지를 스크롤 다운하고 절반만 다시 스크롤 업
-scroll_amount = 1000  # 페이지의 길이에 맞게 조정
-scroll_down(scroll_amount)
-tm.sleep(1)  # 잠시 대기
-scroll_up(scroll_amount // 2)
-
-# 은행 선택을 위한 맵핑
-bank_options = {
-    "하나은행": "081",
-    "경남은행": "039",
-    "광주은행": "034",
-    "국민은행": "004",
-    "기업은행": "003",
-    "농협": "011",
-    "iM뱅크(대구)": "031",
-    "도이치뱅크": "055",
-    "부산은행": "032",
-    "산업은행": "002",
-    "저축은행": "050",
-    "새마을금고": "045",
-    "수협은행": "007",
-    "신협": "048",
-    "신한은행": "088",
-    "우리은행": "020",
-    "우체국": "071",
-    "전북은행": "037",
-    "제주은행": "035",
-    "카카오뱅크": "090",
-    "케이뱅크": "089",
-    "한국씨티은행": "027", 
-    "BOA": "060",
-    "HSBC": "054",
-    "JP모간": "057",
-    "SC제일은행": "023",
-    "하나증권": "270",
-    "교보증권": "261",
-    "대신증권": "267",
-    "미래에셋증권": "238",
-    "DB금융투자": "279",
-    "유안타증권": "209",
-    "메리츠증권": "287",
-    "부국증권": "290",
-    "삼성증권": "240",
-    "신영증권": "291",
-    "신한투자증권": "278",
-    "NH투자증권": "247",
-    "유진증권": "280",
-    "키움증권": "264",
-    "하이투자증권": "262",
-    "한국투자": "243",
-    "한화투자증권": "269",
-    "KB증권": "218",
-    "LS증권": "265",
-    "현대차증권": "263",
-    "케이프증권": "292",
-    "SK증권": "266",
-    "산림조합": "064",
-    "중국공상은행": "062",
-    "중국은행": "063",
-    "중국건설은행": "067",
-    "BNP파리바은행": "061",
-    "한국포스증권": "294",
-    "다올투자증권": "227",
-    "BNK투자증권": "224",
-    "카카오페이증권": "288",
-    "IBK투자증권": "225",
-    "토스증권": "271",
-    "토스뱅크": "092",
-    "상상인증권": "221"
-}
-
-# 은행명 표준화 함수
-def standardize_bank_name(bank_name):
-    bank_name = bank_name.lower().strip()
-    if "sc제일" in bank_name or "제일" in bank_name:
-        return "SC제일은행"
-    elif "제일은행" in bank_name:
-        return "SC제일은행"
-    elif "하나" in bank_name:
-        return "하나은행"
-    elif "경남" in bank_name:
-        return "경남은행"
-    elif "광주" in bank_name:
-        return "광주은행"
-    elif "국민" in bank_name:
-        return "국민은행"
-    elif "기업" in bank_name:
-        return "기업은행"
-    elif "농협은행" in bank_name:
-        return "농협"
-    elif "NH농협" in bank_name:
-        return "농협"
-    elif "nh농협" in bank_name:
-        return "농협"
-    elif "농협/" in bank_name:
-        return "농협"
-    elif "대구" in bank_name:         
-        return "iM뱅크(대구)"
-    elif "im뱅크" in bank_name:
-        return "iM뱅크(대구)"
-    elif "대구은행" in bank_name:
-        return "iM뱅크(대구)"
-    elif "부산" in bank_name:
-        return "부산은행"
-    elif "새마을" in bank_name:
-        return "새마을금고"
-    elif "수협" in bank_name:
-        return "수협은행"
-    elif "신한" in bank_name:
-        return "신한은행"
-    elif "우리" in bank_name:
-        return "우리은행"
-    elif "전북" in bank_name:
-        return "전북은행"
-    elif "제주" in bank_name:
-        return "제주은행"
-    elif "카카오" in bank_name:
-        return "카카오뱅크"
-    elif "카뱅" in bank_name:
-        return "카카오뱅크"
-    elif "씨티" in bank_name:
-        return "한국씨티은행"
-    elif "토스" in bank_name:
-        return "토스뱅크"
-    elif "카카오페이증권" in bank_name:
-        return "카카오페이증권"    
-    elif "미래에셋대우" in bank_name:
-        return "미래에셋증권"
-    elif "미래에셋" in bank_name:
-        return "미래에셋증권"
-       
-       
-    # 필요한 경우 추가 은행명 표준화
-    return bank_name
-
-
-
-# 전처리 함수
-def preprocess_account_info(account_info):
-    # 은행명과 계좌번호 분리
-    match = re.match(r'(\D+)\s*([\d\s\-]+)', account_info)
-    if match:
-        bank_name = standardize_bank_name(match.group(1).strip())
-        account_number = re.sub(r'[\s\-]', '', match.group(2))
-    else:
-        bank_name = ""
-        account_number = ""
-    
-    return bank_name, account_number
-
-# 엑셀 파일 로드
-excel_path = os.path.join(script_dir, "이체정보.xlsx")
-df = pd.read_excel(excel_path)
-
-# 전처리된 데이터를 저장할 리스트
-processed_data = []
+if SESSION_REUSED:
+    print("기존 로그인 세션이 살아 있어 인증서 로그인을 건너뜁니다.")
+else:
+    SLEEP_BUDGET.mark("로그인 페이지")
+    open_certificate_login()
+    SLEEP_BUDGET.mark("인증서 로그인")
+    login_with_certificate()
 
-for index, row in df.iterrows():
-    product_name = row.iloc[3]  # 제품명
-    customer_name = row.iloc[4]  # 이름
-    account_info = row.iloc[7]  # 은행+계좌번호
-    amount = row.iloc[9]  # 금액
+# 로그인 후 메인 프레임에서 다계좌이체 화면으로 이동
+open_multi_transfer_page()
 
-    # 계좌정보 전처리
-    bank_name, account_number = preprocess_account_info(account_info)
+# 백그라운드에서 준비한 이체 정보 (아직 준비 중이면 끝날 때까지 대기)
+with SLEEP_BUDGET.waiting("payout_data"):
+    processed_data, payout_problems = PAYOUT_PREFETCH.result()
 
-    # 항목 1 : 은행
-    # 항목 2 : 계좌번호             
-    # 항목 3 : 이름.제품명
-    # 항목 4 : 제품명
-    name_product = f"{customer_name}{product_name}"
-    processed_data.append((bank_name, account_number, name_product, product_name, amount))
+# 문제 있는 행이 하나라도 있으면 은행 화면에 입력하지 않는다
+data_ok = not payout_problems
+if not data_ok:
+    print("문제 있는 행이 있어 이체 정보를 입력하지 않습니다. 이체정보.xlsx를 확인해주세요.")
 
 # 전처리된 데이터 출력
 for data in processed_data:
@@ -474,140 +486,355 @@ def type_text(element, text):
     element.clear()
     element.send_keys(text)
 
-def type_number(text):
+# 키 입력 방식: "cdp"(브라우저에 직접 키 이벤트 전달) 또는 "pyautogui"(OS 키 입력)
+KEY_INPUT_MODE = "cdp"
+# CDP 입력 결과가 기대값과 다르면 pyautogui로 다시 입력
+KEY_INPUT_FALLBACK = True
+
+def type_number(text, element=None):
+    # TransKey 필드(계좌번호, 금액, 계좌비밀번호)는 CDP 입력 결과를 확인할 수 없으므로 처음부터 OS 키 입력 사용
+    if KEY_INPUT_MODE == "cdp" and element is not None and not is_transkey_field(driver, element):
+        try:
+            if type_with_cdp(driver, element, text):
+                return
+        except Exception as e:
+            print(f"CDP 입력 오류: {e}")
+        if not KEY_INPUT_FALLBACK:
+            return
+        print("pyautogui 입력으로 다시 시도합니다.")
+        element.click()
+        tm.sleep(0.1)
+
     for char in str(text):
         pyautogui.press(char)
         tm.sleep(0.005)
 
+# 다계좌이체 화면의 입력 요소 캐시 (fill_transfer_rows에서 화면마다 한 번 찾음)
+TRANSFER_PAGE = None
+
+def get_transfer_page():
+    global TRANSFER_PAGE
+    if TRANSFER_PAGE is None:
+        TRANSFER_PAGE = MultiTransferPage(driver)
+    return TRANSFER_PAGE
+
+def type_into_field(page, field, index, text):
+    """캐시된 요소를 클릭한 뒤 키 입력으로 값을 넣습니다."""
+    def action(element):
+        element.click()
+        tm.sleep(0.1)  # 첫 번째 문자 입력 전에 짧은 지연을 추가
+        type_number(text, element)
+    page.run(action, field, index)
+
 def input_transfer_info(data, index):
     bank, account_number, name_product, product_name, amount = data
+    page = get_transfer_page()
     
     try:
         # 은행 선택
-        bank_element = driver.find_element(By.ID, f"rcvBnkCd{index}")
         option_value = bank_options.get(bank, "")
         if option_value:
-            option = bank_element.find_element(By.CSS_SELECTOR, f"option[value='{option_value}']")  
-            option.click()
+            page.run(lambda element: element.find_element(By.CSS_SELECTOR, f"option[value='{option_value}']").click(),
+                     BANK_FIELD, index)
             print(f"{name_product} 은행 선택 성공: {bank}")
         else:
             print(f"{name_product} 은행을 찾을 수 없습니다: {bank}")
         
         # 계좌번호 입력
-        account_element = driver.find_element(By.ID, f"rcvAcctNo{index}")
-        account_element.click()
-        tm.sleep(0.1)  # 첫 번째 문자 입력 전에 짧은 지연을 추가
-        type_number(account_number)
+        type_into_field(page, ACCOUNT_FIELD, index, account_number)
         print(f"{name_product} 계좌번호 입력 성공: {account_number}")
         
         # 금액 입력
-        amount_element = driver.find_element(By.ID, f"trnsAmt{index}")
-        amount_element.click()
-        tm.sleep(0.1)  # 첫 번째 문자 입력 전에 짧은 지연을 추가
-        type_number(int(amount))
+        type_into_field(page, AMOUNT_FIELD, index, int(amount))
         print(f"{name_product} 금액 입력 성공: {amount}")
         
         # 이름.제품명 입력
-        name_product_element = driver.find_element(By.ID, f"wdrwPsbkMarkCtt{index}")
-        type_text(name_product_element, name_product)
+        page.run(lambda element: type_text(element, name_product), NAME_PRODUCT_FIELD, index)
         print(f"{name_product} 이름.제품명 입력 성공: {name_product}")
         
         # 제품명 입력
-        product_name_element = driver.find_element(By.ID, f"rcvPsbkMarkCtt{index}")
-        type_text(product_name_element, product_name)
+        page.run(lambda element: type_text(element, product_name), PRODUCT_FIELD, index)
         print(f"{name_product} 제품명 입력 성공: {product_name}")
 
     except Exception as e:
         print(f"오류 발생 {name_product}: {e}")
 
+# True이면 은행 선택과 메모 필드를 한 번의 스크립트로 채우고 계좌번호/금액만 키 입력
+BULK_FILL = True
+
+def input_transfer_batch(batch, plan=None):
+    """은행 선택과 메모 필드는 모든 행을 한 번에 채우고, 계좌번호와 금액만 키 입력으로 넣습니다.
+
+    plan({행 번호: [필드 접두어]})을 주면 비워 둔 그 필드만 입력합니다.
+    다시 입력할 행을 초기화하지 못하면 False를 반환합니다.
+    """
+    try:
+        results = bulk_fill(driver, batch, bank_options, only=plan)
+    except Exception as e:
+        print(f"일괄 입력 오류, 행별 입력으로 진행합니다: {e}")
+        for index, data in enumerate(batch[:MAX_ROWS]):
+            if plan is not None and index not in plan:
+                continue
+            # 행 전체를 다시 입력하므로 남은 값을 모두 비운다 (계좌번호/금액이 이어 붙지 않도록 행 초기화)
+            if plan is not None and clear_fields(driver, {index: list(ROW_FIELDS)}) is None:
+                print(f"{index + 1}번째 행을 초기화할 수 없어 입력을 중단합니다. 다계좌이체 화면을 새로 열어주세요.")
+                return False
+            input_transfer_info(data, index)
+        return True
+
+    for result, data in zip(results, batch):
+        bank, account_number, name_product, product_name, amount = data
+        index = result['index']
+        fields = plan.get(index, ()) if plan is not None else (ACCOUNT_FIELD, AMOUNT_FIELD)
+        if plan is not None and not fields:
+            continue
+        if result['missing'] or result['invalid']:
+            print(f"{name_product} 일괄 입력 실패 - 없는 필드: {result['missing']}, 잘못된 값: {result['invalid']} (은행: {bank})")
+        else:
+            print(f"{name_product} 은행/이름.제품명/제품명 입력 성공: {bank}")
+
+        try:
+            # 계좌번호와 금액은 키보드 보안 때문에 실제 키 입력으로 넣는다
+            if ACCOUNT_FIELD in fields:
+                type_into_field(get_transfer_page(), ACCOUNT_FIELD, index, account_number)
+                print(f"{name_product} 계좌번호 입력 성공: {account_number}")
+
+            if AMOUNT_FIELD in fields:
+                type_into_field(get_transfer_page(), AMOUNT_FIELD, index, int(amount))
+                print(f"{name_product} 금액 입력 성공: {amount}")
+        except Exception as e:
+            print(f"오류 발생 {name_product}: {e}")
+    return True
+
+def fill_transfer_rows(rows, reconcile=False):
+    """최대 10개의 항목을 입력합니다. 은행을 확인할 수 없는 행이 있으면 입력하지 않고 False를 반환합니다.
+
+    reconcile이면 화면에 이미 입력된 값과 비교해 다른 필드만 비우고 다시 입력합니다
+    (계좌번호나 금액이 다른 행은 화면의 행 초기화로 행 전체를 다시 입력).
+    """
+    global TRANSFER_PAGE
+    SLEEP_BUDGET.mark("이체 정보 입력")
+    # 화면의 입력 요소와 은행 선택 목록을 한 번에 찾아 둔다
+    TRANSFER_PAGE = MultiTransferPage(driver)
+    invalid_rows = TRANSFER_PAGE.invalid_banks(rows, bank_options)
+    if invalid_rows:
+        for index, bank in invalid_rows:
+            print(f"{index + 1}번째 행의 은행을 선택할 수 없습니다: {bank}")
+        print("은행명을 확인한 뒤 다시 진행해주세요.")
+        return False
+
+    if reconcile:
+        plan = reconcile_plan(driver, rows[:MAX_ROWS], bank_options)
+        if not plan:
+            print("화면에 입력된 값이 모두 맞아 다시 입력하지 않습니다.")
+            return True
+        for index, fields in plan.items():
+            print(f"{index + 1}번째 행 다시 입력할 필드: {fields}")
+        plan = clear_fields(driver, plan)
+        if plan is None:
+            # 계좌번호/금액 칸을 안전하게 비울 수 없으므로 새 화면에 처음부터 입력
+            print("행 초기화 기능을 찾지 못해 다계좌이체 화면을 새로 열어 입력합니다.")
+            open_multi_transfer_page()
+            TRANSFER_PAGE = MultiTransferPage(driver)
+            input_transfer_batch(rows[:MAX_ROWS])
+            return True
+        return input_transfer_batch(rows[:MAX_ROWS], plan)
+
+    if BULK_FILL:
+        input_transfer_batch(rows[:MAX_ROWS])
+        return True
+    for index, data in enumerate(rows):
+        if index >= MAX_ROWS:
+            break
+        input_transfer_info(data, index)
+        SLEEP_BUDGET.sleep(0.5, "row_pause")  # 각 세트 완료 후 잠시 대기
+    return True
+
 # paymAcctPw에 '5800' 입력
+ACCOUNT_PASSWORD = "5800"
+
 def enter_password():
+    """계좌비밀번호를 입력합니다. 입력했으면 True."""
+    SLEEP_BUDGET.mark("비밀번호 입력")
     try:
-        # 스크롤을 맨 위로 올려서 계좌비밀번호 필드로 이동
-        driver.execute_script("window.scrollTo(0, 0)")
-        tm.sleep(0.5)  # 스크롤 후 잠시 대기
-        
-        password_element = driver.find_element(By.ID, "paymAcctPw")
-        password_element.click()
-        tm.sleep(0.1)  # 첫 번째 문자 입력 전에 짧은 지연을 추가
-        type_number("5800")
+        # 계좌비밀번호 필드가 보이도록 스크롤
+        page = get_transfer_page()
+        page.run(lambda element: scroll_into_view(driver, element), 'password')
+        # 보안 키패드(TransKey, readonly) 필드라 clear()나 스크립트로 비울 수 없음.
+        # 다시 입력하는 화면에서 이미 4자리가 들어 있으면 그대로 두고, 일부만 들어 있으면 이체하지 않는다
+        typed = len(page.run(lambda element: element.get_attribute("value") or "", 'password'))
+        if typed == len(ACCOUNT_PASSWORD):
+            print("비밀번호가 이미 입력되어 있습니다.")
+            return True
+        if typed:
+            print("비밀번호가 일부만 입력되어 있습니다. 다계좌이체 화면을 새로 열어 다시 진행해주세요.")
+            return False
+        type_into_field(page, 'password', None, ACCOUNT_PASSWORD)
         print("비밀번호 입력 성공")
+        return True
     except Exception as e:
         print(f"비밀번호 입력 오류: {e}")
+        return False
 
 # 다계좌이체진행 버튼 클릭
 def click_transfer_button():
+    """다계좌이체진행 버튼을 클릭합니다. 클릭했으면 True."""
+    global TRANSFER_SUBMITTED
+    TRANSFER_SUBMITTED = True
+    SLEEP_BUDGET.mark("이체 진행")
     try:
-        # 1~2초 대기
-        tm.sleep(2)
-                                
-        # 스크롤을 아래로 내려서 버튼 위치로 이동
-        driver.execute_script("window.scrollBy(0, 500)")
-        tm.sleep(0.5)  # 스크롤 후 잠시 대기
-        
-        # 다계좌이체진행 버튼 찾기 및 클릭
-        transfer_button = driver.find_element(By.XPATH, "//a[contains(text(), '다계좌이체진행')]")
-        transfer_button.click()
+        # 다계좌이체진행 버튼이 보이도록 스크롤하고 클릭 가능해지면 바로 클릭 (화면 로드 시 찾아 둔 요소 사용)
+        def click_when_ready(element):
+            scroll_into_view(driver, element)
+            wait_until(EC.element_to_be_clickable(element), "submit")
+            element.click()
+        get_transfer_page().run(click_when_ready, 'submit')
         print("다계좌이체진행 버튼 클릭 성공")
+        return True
     except Exception as e:
         print(f"다계좌이체진행 버튼 클릭 오류: {e}")
+        return False
+
+# 보이스피싱 예방 팝업의 '아니요' 버튼 클릭 (두 유형 모두 같은 버튼 사용)
+def click_voice_phishing_no(driver, name):
+    print(f"보이스피싱 예방 팝업({name}) 감지됨")
+    no_button = driver.find_element(By.XPATH, "//a[contains(@onclick, 'pbk.transfer.common.lonFrdInfoPopN()')]")
+    no_button.click()
+    print("'아니요' 버튼 클릭 성공")
+    return True
+
+# 이체 진행 후 나타날 수 있는 팝업 등록표 (이름, CSS 선택자, 처리 함수)
+POPUPS = PopupDispatcher(driver, SLEEP_BUDGET)
+POPUPS.register("voicePhishingPopup1", "#voicePhishingPopup1", click_voice_phishing_no)
+POPUPS.register("lonFrdInfoPop", "#lonFrdInfoPop", click_voice_phishing_no)
+POPUP_TIMEOUT = 60
 
 # 보이스피싱 예방 팝업 처리 함수
 def handle_voice_phishing_popup():
     try:
-        # 최대 60초 동안 1초마다 팝업 확인
-        for i in range(60):
-            tm.sleep(1)  # 1초 대기
-            print(f"팝업 감지 중... {i+1}초 경과")
-            
-            # 보이스피싱 예방 팝업 존재 여부 확인 - 두 가지 ID 모두 확인
-            voice_phishing_popup1 = driver.find_elements(By.ID, "voicePhishingPopup1")
-            voice_phishing_popup2 = driver.find_elements(By.ID, "lonFrdInfoPop")
-            
-            # 첫 번째 유형의 보이스피싱 팝업 확인
-            if voice_phishing_popup1 and len(voice_phishing_popup1) > 0 and voice_phishing_popup1[0].is_displayed():
-                print("보이스피싱 예방 팝업(voicePhishingPopup1) 감지됨")
-                
-                # '아니요' 버튼 클릭
-                no_button = driver.find_element(By.XPATH, "//a[contains(@onclick, 'pbk.transfer.common.lonFrdInfoPopN()')]")
-                no_button.click()
-                print("'아니요' 버튼 클릭 성공")
-                return True
-                
-            # 두 번째 유형의 보이스피싱 팝업 확인
-            if voice_phishing_popup2 and len(voice_phishing_popup2) > 0 and voice_phishing_popup2[0].is_displayed():
-                print("보이스피싱 예방 팝업(lonFrdInfoPop) 감지됨")
-                
-                # '아니요' 버튼 클릭
-                no_button = driver.find_element(By.XPATH, "//a[contains(@onclick, 'pbk.transfer.common.lonFrdInfoPopN()')]")
-                no_button.click()
-                print("'아니요' 버튼 클릭 성공")
-                return True
-                
-        print("60초 동안 보이스피싱 예방 팝업이 나타나지 않음")
-        return False
+        # 1초 간격 확인 대신 팝업이 보이는 즉시 처리
+        print("팝업 감지 중...")
+        name, handled = POPUPS.dispatch(POPUP_TIMEOUT)
+        if name is None:
+            print(f"{POPUP_TIMEOUT}초 동안 보이스피싱 예방 팝업이 나타나지 않음")
+            return False
+        return handled
     except Exception as e:
         print(f"팝업 처리 중 오류 발생: {e}")
         return False
 
-# 최대 10개의 항목 입력
-for index, data in enumerate(processed_data):
-    if index >= 10:
-        break
-    input_transfer_info(data, index)
-    tm.sleep(0.5)  # 각 세트 완료 후 잠시 대기
+# 이체 결과 화면 저장 폴더와 행별 결과 기록 (4. 이체내역백업 및 완료입력.py에서 읽음)
+RESULT_DIR = os.path.join(script_dir, "transfer_results")
+OUTCOMES_PATH = os.path.join(script_dir, "transfer_outcomes.jsonl")
+
+def wait_transfer_result():
+    """이체 결과 표가 나타날 때까지 기다립니다. 나타나면(은행이 이체를 접수했으면) True."""
+    SLEEP_BUDGET.mark("이체 결과 확인")
+    try:
+        wait_until(EC.presence_of_element_located((By.XPATH, RESULT_HEADER_XPATH)), "result")
+        return True
+    except TimeoutException:
+        print("이체 결과 표를 찾지 못했습니다. 현재 화면을 그대로 저장합니다.")
+        return False
+
+def record_transfer_result(batch, number=None):
+    """이체 결과 화면을 저장하고 행별 성공/실패를 기록합니다. 모든 행이 성공이면 True."""
+    try:
+        html = driver.page_source
+        label = f"batch{number + 1}" if number is not None else "single"
+        snapshot = save_result_snapshot(html, RESULT_DIR, label)
+        outcomes = match_outcomes(batch, parse_result_rows(html), snapshot, number)
+    except Exception as e:
+        print(f"이체 결과 확인 중 오류 발생: {e}")
+        return False
+    write_outcomes(OUTCOMES_PATH, outcomes)
+
+    counts = {status: sum(1 for outcome in outcomes if outcome['status'] == status) for status in (SUCCESS, FAILED)}
+    unknown = len(outcomes) - counts[SUCCESS] - counts[FAILED]
+    print(f"이체 결과: 성공 {counts[SUCCESS]}건, 실패 {counts[FAILED]}건, 확인 불가 {unknown}건 ({OUTCOMES_PATH})")
+    for outcome in outcomes:
+        if outcome['status'] != SUCCESS:
+            print(f"⚠ {outcome['row']}번째 행({outcome['name_product']}): {outcome['status']} {outcome['result']} {outcome['message']}")
+    return counts[SUCCESS] == len(outcomes)
+
+def report_transfer_result(batch):
+    wait_transfer_result()
+    if record_transfer_result(batch[:MAX_ROWS]):
+        print("이체가 완료되었습니다.")
+    else:
+        print("이체 결과를 확인해야 하는 행이 있습니다. 위 목록을 확인해주세요.")
+
+def process_transfer_batch(number, batch, first, reconcile=False):
+    """배치 하나를 입력하고 이체합니다. 첫 배치가 아니면 다계좌이체 화면으로 다시 이동합니다.
+
+    reconcile이면 (첫 배치에서) 화면에 이미 입력된 값과 비교해 다른 필드만 다시 입력합니다.
+    """
+    if not first:
+        open_multi_transfer_page()
+    if not fill_transfer_rows(batch, reconcile=reconcile and first):
+        return "invalid"
+    if not enter_password() or not click_transfer_button():
+        return "failed"
+    # 버튼을 누른 뒤에는 이미 이체됐을 수 있으므로 결과 표를 확인하지 못하면 unconfirmed로 남긴다
+    # (unconfirmed 배치는 은행 이체내역을 확인해 BATCH_OVERRIDES로 지정하기 전에는 다시 진행하지 않음)
+    try:
+        handle_voice_phishing_popup()
+        # 결과 표가 나타나야 은행이 이체를 접수한 것으로 봄
+        accepted = wait_transfer_result()
+    except Exception as e:
+        print(f"이체 결과 확인 중 오류 발생: {e}")
+        accepted = False
+    record_transfer_result(batch, number)
+    if not accepted:
+        print("이체 결과 표가 나타나지 않았습니다. 은행 이체내역에서 이 배치가 처리됐는지 확인해주세요.")
+        return UNCONFIRMED
+    # 실패한 행이 있어도 배치는 이미 제출되었으므로 다음 배치로 진행 (행별 결과는 따로 기록)
+    return SUBMITTED
+
+# 10건이 넘으면 10건씩 나눠 차례로 이체 (자동 진행일 때만)
+AUTO_CHUNK = True
+# 배치 진행 상황 파일 (중단 후 다시 실행하면 이체되지 않은 배치부터 이어서 진행)
+BATCH_PROGRESS_PATH = os.path.join(script_dir, "transfer_progress.json")
+# 특정 배치부터 시작하려면 배치 번호(0부터)를 지정
+BATCH_START = None
+# 결과를 확인하지 못한(unconfirmed) 배치를 은행 이체내역에서 확인한 뒤 지정
+# 예: {2: "submitted"} (이체됨, 건너뜀) 또는 {2: "failed"} (이체 안 됨, 다시 진행)
+BATCH_OVERRIDES = {}
+
+def run_transfer_pass(rows, auto, reconcile=False, start=None):
+    """이체 목록을 입력하고 auto이면 이체합니다.
+
+    자동 이체이고 10건이 넘으면 run_batches로 10건씩 나눠 진행하고, 아니면 한 화면(최대 10건)만 입력합니다.
+    """
+    if AUTO_CHUNK and auto and len(rows) > MAX_ROWS:
+        batch_progress = BatchProgress(BATCH_PROGRESS_PATH, rows)
+        run_batches(rows, lambda number, batch, first: process_transfer_batch(number, batch, first, reconcile),
+                    batch_progress, start=start, overrides=BATCH_OVERRIDES)
+        print(f"배치 진행 상황이 {BATCH_PROGRESS_PATH}에 저장되었습니다.")
+        return
+
+    if len(rows) > MAX_ROWS:
+        print(f"⚠ {len(rows)}건 중 앞의 {MAX_ROWS}건만 입력합니다. 나머지는 자동 진행으로 나눠서 이체해주세요.")
+    # 최대 10개의 항목 입력
+    rows_ok = fill_transfer_rows(rows, reconcile=reconcile)
 
-# 이체 정보 입력 후 비밀번호 입력
-enter_password()
+    # 이체 정보 입력 후 비밀번호 입력
+    password_ok = enter_password()
 
-# 자동/수동에 따른 처리
-if auto_transfer:
-    # 다계좌이체진행 버튼 클릭
-    click_transfer_button()
+    # 자동/수동에 따른 처리 (모든 행과 비밀번호가 입력된 경우에만 자동 진행)
+    if auto and rows_ok and password_ok:
+        # 다계좌이체진행 버튼 클릭 (누르지 못했으면 결과를 기다리지 않음)
+        if click_transfer_button():
+            # 보이스피싱 예방 팝업 처리
+            handle_voice_phishing_popup()
+            report_transfer_result(rows)
+        else:
+            print("다계좌이체진행 버튼을 누르지 못했습니다. 화면을 확인한 뒤 수동으로 진행해주세요.")
+    else:
+        print("이체가 취소되었습니다. 필요시 수동으로 다계좌이체진행 버튼을 클릭하세요.")
 
-    # 보이스피싱 예방 팝업 처리
-    handle_voice_phishing_popup()
-    print("이체가 완료되었습니다.")     
+if data_ok:
+    run_transfer_pass(processed_data, auto_transfer, start=BATCH_START)
 else:
     print("이체가 취소되었습니다. 필요시 수동으로 다계좌이체진행 버튼을 클릭하세요.")
 
@@ -616,386 +843,126 @@ print("\n" + "="*50)
 print("이체 작업이 완료되었습니다!")
 print("="*50)
 
-# 무한 루프로 계속 진행
-while True:
-    sheet_organize_input = input("🟢시트 순서를 변경하시겠습니까? (y/n): ")
-    if sheet_organize_input.lower() == 'y':
-        print("시트 순서 변경을 시작합니다...")
-    
-    # 1. 시트순서변경.py의 기능을 여기에 통합
-    import openpyxl
-    from pathlib import Path
-    
-    def organize_excel_sheets(file_path):
-        try:
-            # 엑셀 파일 로드
+# 1. 시트순서변경.py의 기능을 여기에 통합
+import openpyxl
+from pathlib import Path
+
+def organize_excel_sheets(file_path):
+    try:
+        # 엑셀 파일 로드
+        workbook = openpyxl.load_workbook(file_path)
+
+        while True:
+            # 워크북을 다시 로드하여 현재 상태 확인
             workbook = openpyxl.load_workbook(file_path)
-            
-            while True:
-                # 워크북을 다시 로드하여 현재 상태 확인
-                workbook = openpyxl.load_workbook(file_path)
-                current_sheets = workbook.sheetnames
-                print(f"\n현재 맨 앞에 있는 시트명은 👉 '{current_sheets[0]}'입니다.")
-                
-                # 사용자 입력 받기
-                user_input = input("🟢어떤 시트를 맨앞으로 가져올까요? (숫자 또는 시트명 입력, 'clean'으로 정리, 'exit'로 종료): ")
-                
-                if user_input.lower() == 'exit':
-                    break
-                    
-                if user_input.lower() == 'clean':
-                    # Sheet1부터 Sheet10까지 순서대로 정렬
-                    standard_sheets = sorted([s for s in current_sheets if s.startswith('Sheet') and s[5:].isdigit()], 
-                                          key=lambda x: int(x[5:]))  # Sheet 뒤의 숫자로 정렬
-                    other_sheets = [sheet for sheet in current_sheets if sheet not in standard_sheets]
-                    
-                    # 시트 순서 재배열
-                    sheet_order = standard_sheets + other_sheets
-                    workbook._sheets = [workbook[sheet_name] for sheet_name in sheet_order]
-                    print("시트를 Sheet1-10 순서로 정리했습니다.")
-                    
+            current_sheets = workbook.sheetnames
+            print(f"\n현재 맨 앞에 있는 시트명은 👉 '{current_sheets[0]}'입니다.")
+
+            # 사용자 입력 받기
+            user_input = input("🟢어떤 시트를 맨앞으로 가져올까요? (숫자 또는 시트명 입력, 'clean'으로 정리, 'exit'로 종료): ")
+
+            if user_input.lower() == 'exit':
+                break
+
+            if user_input.lower() == 'clean':
+                # Sheet1부터 Sheet10까지 순서대로 정렬
+                standard_sheets = sorted([s for s in current_sheets if s.startswith('Sheet') and s[5:].isdigit()], 
+                                      key=lambda x: int(x[5:]))  # Sheet 뒤의 숫자로 정렬
+                other_sheets = [sheet for sheet in current_sheets if sheet not in standard_sheets]
+
+                # 시트 순서 재배열
+                sheet_order = standard_sheets + other_sheets
+                workbook._sheets = [workbook[sheet_name] for sheet_name in sheet_order]
+                print("시트를 Sheet1-10 순서로 정리했습니다.")
+
+            else:
+                # 숫자나 시트명으로 입력받은 경우
+                target_sheet = None
+
+                # 숫자로 입력받은 경우
+                if user_input.isdigit():
+                    sheet_name = f"Sheet{user_input}"
+                    if sheet_name in current_sheets:
+                        target_sheet = sheet_name
+
+                # 시트명으로 입력받은 경우
+                elif user_input in current_sheets:
+                    target_sheet = user_input
+
+                if target_sheet:
+                    # 시트 순서 변경 - 1.시트순서변경.py와 동일한 방법
+                    sheets = workbook._sheets
+
+                    # 먼저 Sheet1을 맨 뒤로 이동 (target이 Sheet1이 아닌 경우에만)
+                    if target_sheet != "Sheet1" and "Sheet1" in current_sheets:
+                        sheet1_idx = current_sheets.index("Sheet1")
+                        sheets.append(sheets.pop(sheet1_idx))
+
+                    # 그 다음 선택한 시트를 맨 앞으로 이동
+                    target_idx = workbook.sheetnames.index(target_sheet)  # 현재 시트 위치 다시 확인
+                    sheet_to_move = sheets.pop(target_idx)
+                    sheets.insert(0, sheet_to_move)
+
+                    print(f"'{target_sheet}'를 맨 앞으로 이동했습니다.")
                 else:
-                    # 숫자나 시트명으로 입력받은 경우
-                    target_sheet = None
-                    
-                    # 숫자로 입력받은 경우
-                    if user_input.isdigit():
-                        sheet_name = f"Sheet{user_input}"
-                        if sheet_name in current_sheets:
-                            target_sheet = sheet_name
-                            
-                    # 시트명으로 입력받은 경우
-                    elif user_input in current_sheets:
-                        target_sheet = user_input
-                        
-                    if target_sheet:
-                        # 시트 순서 변경 - 1.시트순서변경.py와 동일한 방법
-                        sheets = workbook._sheets
-                        
-                        # 먼저 Sheet1을 맨 뒤로 이동 (target이 Sheet1이 아닌 경우에만)
-                        if target_sheet != "Sheet1" and "Sheet1" in current_sheets:
-                            sheet1_idx = current_sheets.index("Sheet1")
-                            sheets.append(sheets.pop(sheet1_idx))
-                            
-                        # 그 다음 선택한 시트를 맨 앞으로 이동
-                        target_idx = workbook.sheetnames.index(target_sheet)  # 현재 시트 위치 다시 확인
-                        sheet_to_move = sheets.pop(target_idx)
-                        sheets.insert(0, sheet_to_move)
-                        
-                        print(f"'{target_sheet}'를 맨 앞으로 이동했습니다.")
-                    else:
-                        print(f"해당 시트를 찾을 수 없습니다.")
-                        print("현재 시트 목록:", current_sheets)
-                
-                # 변경사항 저장
-                workbook.save(file_path)
-                
-            workbook.close()
-            
-        except Exception as e:
-            print(f"에러가 발생했습니다: {str(e)}")
-            print("현재 시트 목록:", workbook.sheetnames)
-    
-    # 시트 순서 변경 실행
-    current_dir = Path(__file__).parent  # 현재 스크립트 파일의 디렉토리
-    file_path = current_dir / "이체정보.xlsx"  # 상대 경로로 파일 지정
+                    print(f"해당 시트를 찾을 수 없습니다.")
+                    print("현재 시트 목록:", current_sheets)
+
+            # 변경사항 저장
+            workbook.save(file_path)
+
+        workbook.close()
+
+    except Exception as e:
+        print(f"에러가 발생했습니다: {str(e)}")
+        print("현재 시트 목록:", workbook.sheetnames)
+
+current_dir = Path(__file__).parent  # 현재 스크립트 파일의 디렉토리
+file_path = current_dir / "이체정보.xlsx"  # 상대 경로로 파일 지정
+
+# 시트 순서 변경 → 다시 이체를 원하는 만큼 반복
+while True:
+    sheet_organize_input = input("🟢시트 순서를 변경하시겠습니까? (y/n): ")
+    if sheet_organize_input.lower() != 'y':
+        print("시트 순서 변경을 건너뜁니다.")
+        continue
+    print("시트 순서 변경을 시작합니다...")
     organize_excel_sheets(str(file_path))  # Path 객체를 문자열로 변환
-    
     print("시트 순서 변경이 완료되었습니다.")
-    
+
     # 시트 변경 후 이체 진행 여부 묻기
     retry_transfer_input = input("🟢시트를 변경했으니 다시 이체를 진행할까요? (y/n): ")
-    if retry_transfer_input.lower() == 'y':
-        print("이체를 다시 진행합니다...")
-        
-        # 다계좌이체진행 자동/수동 여부 묻기
-        retry_auto_transfer_input = input("🟠다계좌이체진행(자동)을 함께 진행할까요? (y/n): ")
-        retry_auto_transfer = retry_auto_transfer_input.lower() == 'y'
-        
-        # 웹페이지 상태 확인 및 다계좌이체 페이지로 이동
-        try:
-            # 프레임 전환
-            driver.switch_to.default_content()  # 기본 프레임으로 돌아가기
-            frame_id = "hanaMainframe"
-            driver.switch_to.frame(frame_id)
-            
-            # 이체 메뉴 클릭
-            transfer_link = driver.find_element(By.XPATH, "//a[@title='이체' and text()='이체']")
-            transfer_link.click()
-            print("'이체' 메뉴 링크를 클릭했습니다.")
-            tm.sleep(1)     
-            
-            # 다계좌 이체 버튼 클릭
-            try:
-                # 먼저 이미지 인식으로 다계좌이체 버튼 찾기 시도
-                if locate_and_click("multisend"):
-                    print("이미지 인식으로 다계좌이체 버튼 클릭 성공")
-                else:
-                    # 이미지 인식 실패 시 탭으로 이동
-                    print("이미지 인식 실패, 탭으로 다계좌이체 버튼 찾기")
-                    for _ in range(6):   # 탭 6번
-                        pyautogui.press('tab')
-                    pyautogui.press('enter')   
-                    print("탭으로 다계좌이체 버튼 클릭 완료")
-            except Exception as e:
-                print(f"다계좌이체 버튼 클릭 중 오류: {e}")
-                # 실패 시 기존 방식으로 시도
-                for _ in range(6):   # 탭 6번
-                    pyautogui.press('tab')
-                pyautogui.press('enter')   
-            tm.sleep(3)
-            
-            # 스크롤 조정
-            scroll_amount = 1000
-            scroll_down(scroll_amount)
-            tm.sleep(1)
-            scroll_up(scroll_amount // 2)
-            
-        except Exception as e:
-            print(f"웹페이지 설정 중 오류 발생: {e}")
-            print("수동으로 다계좌이체 페이지로 이동해주세요.")
-        
-        # 이체 정보 입력 - 현재 첫 번째 시트에서 데이터 다시 로드
-        df_retry2 = pd.read_excel(excel_path, sheet_name=0)  # 현재 첫 번째 시트 사용
-        processed_data_retry2 = []
-        
-        for index, row in df_retry2.iterrows():
-            product_name = row.iloc[3]  # 제품명
-            customer_name = row.iloc[4]  # 이름
-            account_info = row.iloc[7]  # 은행+계좌번호
-            amount = row.iloc[9]  # 금액
-
-            # 계좌정보 전처리
-            bank_name, account_number = preprocess_account_info(account_info)
-            name_product = f"{customer_name}{product_name}"
-            processed_data_retry2.append((bank_name, account_number, name_product, product_name, amount))
-        
-        for index, data in enumerate(processed_data_retry2):
-            if index >= 10:
-                break
-            input_transfer_info(data, index)
-            tm.sleep(0.5)  # 각 세트 완료 후 잠시 대기
-
-        # 비밀번호 입력
-        enter_password()
+    if retry_transfer_input.lower() != 'y':
+        print("이체를 건너뜁니다.")
+        continue
+    print("이체를 다시 진행합니다...")
 
-        # 자동/수동에 따른 처리
-        if retry_auto_transfer:
-            # 다계좌이체진행 버튼 클릭
-            click_transfer_button()
+    # 다계좌이체진행 자동/수동 여부 묻기
+    retry_auto_transfer_input = input("🟠다계좌이체진행(자동)을 함께 진행할까요? (y/n): ")
+    retry_auto_transfer = retry_auto_transfer_input.lower() == 'y'
 
-            # 보이스피싱 예방 팝업 처리
-            handle_voice_phishing_popup()
-            print("이체가 완료되었습니다.")
-        else:
-            print("이체가 취소되었습니다. 필요시 수동으로 다계좌이체진행 버튼을 클릭하세요.")
-        
-        # 이체 완료 후 다시 시트 순서 변경 여부 묻기
-        print("\n" + "="*50)
-        print("이체 작업이 완료되었습니다!")
-        print("="*50)
-        
-        # 재귀적으로 시트 순서 변경 여부 묻기
-        sheet_organize_input = input("🟢시트 순서를 변경하시겠습니까? (y/n): ")
-        if sheet_organize_input.lower() == 'y':
-            print("시트 순서 변경을 시작합니다...")
-            organize_excel_sheets(str(file_path))
-            print("시트 순서 변경이 완료되었습니다.")
-            
-            # 다시 이체 진행 여부 묻기
-            retry_transfer_input2 = input("🟢시트를 변경했으니 다시 이체를 진행할까요? (y/n): ")
-            if retry_transfer_input2.lower() == 'y':
-                print("이체를 다시 진행합니다...")
-                
-                # 다계좌이체진행 자동/수동 여부 묻기
-                retry_auto_transfer_input2 = input("🟠다계좌이체진행(자동)을 함께 진행할까요? (y/n): ")
-                retry_auto_transfer2 = retry_auto_transfer_input2.lower() == 'y'
-                
-                # 웹페이지 상태 확인 및 다계좌이체 페이지로 이동
-                try:
-                    # 프레임 전환
-                    driver.switch_to.default_content()  # 기본 프레임으로 돌아가기
-                    frame_id = "hanaMainframe"
-                    driver.switch_to.frame(frame_id)
-                    
-                    # 이체 메뉴 클릭
-                    transfer_link = driver.find_element(By.XPATH, "//a[@title='이체' and text()='이체']")
-                    transfer_link.click()
-                    print("'이체' 메뉴 링크를 클릭했습니다.")
-                    tm.sleep(1)
-                    
-                    # 다계좌 이체 버튼 클릭
-                    try:
-                        # 먼저 이미지 인식으로 다계좌이체 버튼 찾기 시도
-                        if locate_and_click("multisend"):
-                            print("이미지 인식으로 다계좌이체 버튼 클릭 성공")
-                        else:
-                            # 이미지 인식 실패 시 탭으로 이동
-                            print("이미지 인식 실패, 탭으로 다계좌이체 버튼 찾기")
-                            for _ in range(6):   # 탭 6번
-                                pyautogui.press('tab')
-                            pyautogui.press('enter')   
-                            print("탭으로 다계좌이체 버튼 클릭 완료")
-                    except Exception as e:
-                        print(f"다계좌이체 버튼 클릭 중 오류: {e}")
-                        # 실패 시 기존 방식으로 시도
-                        for _ in range(6):   # 탭 6번
-                            pyautogui.press('tab')
-                        pyautogui.press('enter')   
-                    tm.sleep(3)
-                    
-                    # 스크롤 조정
-                    scroll_amount = 1000
-                    scroll_down(scroll_amount)
-                    tm.sleep(1)
-                    scroll_up(scroll_amount // 2)
-                    
-                except Exception as e:
-                    print(f"웹페이지 설정 중 오류 발생: {e}")
-                    print("수동으로 다계좌이체 페이지로 이동해주세요.")
-                
-                # 이체 정보 입력 - 현재 첫 번째 시트에서 데이터 다시 로드
-                df_retry = pd.read_excel(excel_path, sheet_name=0)  # 현재 첫 번째 시트 사용
-                processed_data_retry = []
-                
-                for index, row in df_retry.iterrows():
-                    product_name = row.iloc[3]  # 제품명
-                    customer_name = row.iloc[4]  # 이름
-                    account_info = row.iloc[7]  # 은행+계좌번호
-                    amount = row.iloc[9]  # 금액
-
-                    # 계좌정보 전처리
-                    bank_name, account_number = preprocess_account_info(account_info)
-                    name_product = f"{customer_name}{product_name}"
-                    processed_data_retry.append((bank_name, account_number, name_product, product_name, amount))
-                
-                for index, data in enumerate(processed_data_retry):
-                    if index >= 10:
-                        break
-                    input_transfer_info(data, index)
-                    tm.sleep(0.5)  # 각 세트 완료 후 잠시 대기
-
-                # 비밀번호 입력
-                enter_password()
-
-                # 자동/수동에 따른 처리
-                if retry_auto_transfer2:
-                    # 다계좌이체진행 버튼 클릭
-                    click_transfer_button()
-
-                    # 보이스피싱 예방 팝업 처리
-                    handle_voice_phishing_popup()
-                    print("이체가 완료되었습니다.")
-                else:
-                    print("이체가 취소되었습니다. 필요시 수동으로 다계좌이체진행 버튼을 클릭하세요.")
-                
-                # 이체 완료 후 다시 시트 순서 변경 여부 묻기
-                print("\n" + "="*50)
-                print("이체 작업이 완료되었습니다!")
-                print("="*50)
-                
-                # 재귀적으로 시트 순서 변경 여부 묻기
-                sheet_organize_input2 = input("🟢시트 순서를 변경하시겠습니까? (y/n): ")
-                if sheet_organize_input2.lower() == 'y':
-                    print("시트 순서 변경을 시작합니다...")
-                    organize_excel_sheets(str(file_path))
-                    print("시트 순서 변경이 완료되었습니다.")
-                    
-                    # 다시 이체 진행 여부 묻기
-                    retry_transfer_input3 = input("🟢시트를 변경했으니 다시 이체를 진행할까요? (y/n): ")
-                    if retry_transfer_input3.lower() == 'y':
-                        print("이체를 다시 진행합니다...")
-                        
-                        # 다계좌이체진행 자동/수동 여부 묻기
-                        retry_auto_transfer_input3 = input("🟠다계좌이체진행(자동)을 함께 진행할까요? (y/n): ")
-                        retry_auto_transfer3 = retry_auto_transfer_input3.lower() == 'y'
-                        
-                        # 웹페이지 상태 확인 및 다계좌이체 페이지로 이동
-                        try:
-                            # 프레임 전환
-                            driver.switch_to.default_content()  # 기본 프레임으로 돌아가기
-                            frame_id = "hanaMainframe"
-                            driver.switch_to.frame(frame_id)
-                            
-                            # 이체 메뉴 클릭
-                            transfer_link = driver.find_element(By.XPATH, "//a[@title='이체' and text()='이체']")
-                            transfer_link.click()
-                            print("'이체' 메뉴 링크를 클릭했습니다.")
-                            tm.sleep(1)
-                            
-                            # 다계좌 이체 버튼 클릭
-                            try:
-                                # 먼저 이미지 인식으로 다계좌이체 버튼 찾기 시도
-                                if locate_and_click("multisend"):
-                                    print("이미지 인식으로 다계좌이체 버튼 클릭 성공")
-                                else:
-                                    # 이미지 인식 실패 시 탭으로 이동
-                                    print("이미지 인식 실패, 탭으로 다계좌이체 버튼 찾기")
-                                    for _ in range(6):   # 탭 6번
-                                        pyautogui.press('tab')
-                                    pyautogui.press('enter')   
-                                    print("탭으로 다계좌이체 버튼 클릭 완료")
-                            except Exception as e:
-                                print(f"다계좌이체 버튼 클릭 중 오류: {e}")
-                                # 실패 시 기존 방식으로 시도
-                                for _ in range(6):   # 탭 6번
-                                    pyautogui.press('tab')
-                                pyautogui.press('enter')   
-                            tm.sleep(3)
-                            
-                            # 스크롤 조정
-                            scroll_amount = 1000
-                            scroll_down(scroll_amount)
-                            tm.sleep(1)
-                            scroll_up(scroll_amount // 2)
-                            
-                        except Exception as e:
-                            print(f"웹페이지 설정 중 오류 발생: {e}")
-                            print("수동으로 다계좌이체 페이지로 이동해주세요.")
-                        
-                        # 이체 정보 입력 - 현재 첫 번째 시트에서 데이터 다시 로드
-                        df_retry3 = pd.read_excel(excel_path, sheet_name=0)  # 현재 첫 번째 시트 사용
-                        processed_data_retry3 = []
-                        
-                        for index, row in df_retry3.iterrows():
-                            product_name = row.iloc[3]  # 제품명
-                            customer_name = row.iloc[4]  # 이름
-                            account_info = row.iloc[7]  # 은행+계좌번호
-                            amount = row.iloc[9]  # 금액
-
-                            # 계좌정보 전처리
-                            bank_name, account_number = preprocess_account_info(account_info)
-                            name_product = f"{customer_name}{product_name}"
-                            processed_data_retry3.append((bank_name, account_number, name_product, product_name, amount))
-                        
-                        for index, data in enumerate(processed_data_retry3):
-                            if index >= 10:
-                                break
-                            input_transfer_info(data, index)
-                            tm.sleep(0.5)  # 각 세트 완료 후 잠시 대기
-
-                        # 비밀번호 입력
-                        enter_password()
-
-                        # 자동/수동에 따른 처리
-                        if retry_auto_transfer3:
-                            # 다계좌이체진행 버튼 클릭
-                            click_transfer_button()
-
-                            # 보이스피싱 예방 팝업 처리
-                            handle_voice_phishing_popup()
-                            print("이체가 완료되었습니다.")
-                        else:
-                            print("이체가 취소되었습니다. 필요시 수동으로 다계좌이체진행 버튼을 클릭하세요.")
-                    else:
-                        print("이체를 건너뜁니다.")
-                else:
-                    print("시트 순서 변경을 건너뜁니다.")
-            else:
-                print("이체를 건너뜁니다.")
+    # 웹페이지 상태 확인 및 다계좌이체 페이지로 이동
+    try:
+        # 이체하지 않은 입력 화면이 남아 있으면 이동하지 않고 다른 필드만 고친다
+        if multi_transfer_form_open():
+            print("다계좌이체 화면이 열려 있어 입력된 값과 비교해 다시 입력합니다.")
         else:
-            print("시트 순서 변경을 건너뜁니다.")
+            open_multi_transfer_page()
+    except Exception as e:
+        print(f"웹페이지 설정 중 오류 발생: {e}")
+        print("수동으로 다계좌이체 페이지로 이동해주세요.")
+
+    # 이체 정보 입력 - 현재 첫 번째 시트에서 데이터 다시 로드
+    processed_data_retry, payout_problems_retry = prepare_payout_rows(excel_path, bank_options, sheet_name=0)  # 현재 첫 번째 시트 사용
+    print_payout_problems(payout_problems_retry)
+    if payout_problems_retry:
+        print("문제 있는 행이 있어 이체 정보를 입력하지 않습니다. 이체정보.xlsx를 확인해주세요.")
     else:
-        print("이체를 건너뜁니다.")
+        run_transfer_pass(processed_data_retry, retry_auto_transfer, reconcile=True)
+
+    # 이체 완료 후 다시 시트 순서 변경 여부 묻기
+    print("\n" + "="*50)
+    print("이체 작업이 완료되었습니다!")
+    print("="*50)
 
 ## 1.2ver 완성
\ No newline at end of file
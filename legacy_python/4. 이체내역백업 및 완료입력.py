@@ -10,9 +10,18 @@ if API_KEY_MODULE_DIR not in sys.path:
     sys.path.insert(0, API_KEY_MODULE_DIR)
 
 from auth import get_credentials
+from transfer_result import SUCCESS, load_outcomes, take_outcome
 
 SPREADSHEET_ID = '1CK2UXTy7HKjBe2T0ovm5hfzAAKZxZAR_ev3cbTPOMPs'
 
+# 3. 이체집행*.py가 기록한 행별 이체 결과. 오늘 기록이 있으면 이체에 성공한 입금요청 행만 입금완료로 바꿈
+# (False이면 결과 기록을 보지 않고 모든 입금요청 행을 입금완료로 바꾸는 기존 방식)
+USE_TRANSFER_OUTCOMES = True
+# 오늘 이체 결과 기록이 없을 때 모든 입금요청 행을 입금완료로 바꿀지 여부.
+# False이면 아무 행도 바꾸지 않고 종료 (이체가 실패했거나 다른 PC에서 이체한 경우 잘못 완료 처리되는 것을 막음)
+MARK_ALL_WITHOUT_OUTCOMES = False
+OUTCOMES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transfer_outcomes.jsonl")
+
 def update_sheets():
     try:
         creds = get_credentials()
@@ -23,10 +32,23 @@ def update_sheets():
 
         sheet_map = {sheet['properties']['title']: sheet['properties']['sheetId'] for sheet in sheets}
 
+        outcomes = load_outcomes(OUTCOMES_PATH) if USE_TRANSFER_OUTCOMES else None
+        if outcomes:
+            print(f"오늘 이체 결과 {len(outcomes)}건을 기준으로 성공한 행만 입금완료 처리합니다.")
+        elif not USE_TRANSFER_OUTCOMES:
+            print("이체 결과 기록을 사용하지 않고 모든 입금요청 행을 입금완료 처리합니다.")
+        elif MARK_ALL_WITHOUT_OUTCOMES:
+            outcomes = None
+            print("오늘 이체 결과 기록이 없어 모든 입금요청 행을 입금완료 처리합니다. (MARK_ALL_WITHOUT_OUTCOMES)")
+        else:
+            print(f"오늘 이체 결과 기록이 없어 입금완료 처리를 하지 않습니다. ({OUTCOMES_PATH})")
+            print("모든 입금요청 행을 입금완료로 바꾸려면 MARK_ALL_WITHOUT_OUTCOMES를 True로 설정하세요.")
+            return
+
         for sheet_name, sheet_id in sheet_map.items():
             # '완료'가 포함된 시트명은 제외
             if '완료' not in sheet_name:
-                process_sheet(service, sheet_id, sheet_name)
+                process_sheet(service, sheet_id, sheet_name, outcomes)
             else:
                 print(f"'{sheet_name}' 시트는 '완료'가 포함되어 제외됩니다.")
 
@@ -37,7 +59,7 @@ def update_sheets():
             time.sleep(30)
             update_sheets()  # 재시도
 
-def process_sheet(service, sheet_id, sheet_name):
+def process_sheet(service, sheet_id, sheet_name, outcomes=None):
     print(f"Processing sheet: {sheet_name} (ID: {sheet_id})")
     
     range_name = f'{sheet_name}!A1:P1000'  # P열까지만 범위 지정
@@ -58,6 +80,15 @@ def process_sheet(service, sheet_id, sheet_name):
             status = row[15].strip() if len(row) > 15 else ''
             if status.lower() in ['입금요청', '입금오류']:
                 if status.lower() == '입금요청':
+                    if outcomes is not None:
+                        # 계좌번호와 금액이 같은 이체 결과를 찾아 성공한 경우에만 입금완료
+                        outcome = take_outcome(outcomes, row)
+                        if outcome is None:
+                            print(f"Row {row_index}: 이체 결과 없음, 건너뜀")
+                            continue
+                        if outcome['status'] != SUCCESS:
+                            print(f"Row {row_index}: 이체 {outcome['status']} ({outcome['result']} {outcome['message']}), 건너뜀")
+                            continue
                     requests.append(update_row_color(sheet_id, row_index, '진한 회색 1'))
                     requests.append(update_cell_value(sheet_id, row_index, 15, get_deposit_complete_text()))
                     print(f"Row {row_index}: 입금요청 처리")
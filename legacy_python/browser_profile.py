@@ -0,0 +1,121 @@
+"""이체 흐름에 필요 없는 리소스를 막는 가벼운 브라우저 설정과 화면 로드 시간 기록
+
+차단 목록은 CDP Network.setBlockedURLs로 적용하므로 새로 띄운 Chrome과
+원격 디버깅으로 붙은 Chrome 모두에 동작합니다.
+
+    python browser_profile.py page_timings.jsonl   # 설정 사용/미사용별 로드 시간 비교
+"""
+import argparse
+import json
+import statistics
+from datetime import datetime
+
+# 차단할 URL 패턴 (* 와일드카드). 광고/추적, 배너/이벤트 이미지
+# 웹 글꼴은 막지 않는다 (버튼 글자 모양이 바뀌면 화면 이미지 매칭이 실패함)
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*facebook.com/tr*",
+    "*criteo.com*",
+    "*kebhana.com*/banner/*",
+    "*kebhana.com*/event/*",
+    "*kebhana.com*/popup/*.jpg",
+    "*kebhana.com*/popup/*.png",
+]
+
+# 인증서 로그인, 키보드 보안, 가상 키패드에 필요한 리소스 (이 문자열이 들어간 패턴은 절대 차단하지 않음)
+NEVER_BLOCK_KEYWORDS = (
+    "cert", "secu", "sign", "delfino", "wizvera", "veraport", "touchen", "nxkey", "raon",
+    "keypad", "transkey", "ipinside", "interezen", "crosscert", "yessign", "kica", "xecure",
+    "magicline", "anysign", "nprotect", "astx", "ahnlab", "login", "keyboard",
+)
+
+# Navigation Timing과 리소스 수를 읽는 스크립트 (현재 문서 기준, 밀리초)
+PAGE_TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    url: location.href,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav ? nav.loadEventEnd : null,
+    resources: resources.length,
+    transfer_bytes: bytes + (nav ? nav.transferSize || 0 : 0)
+};
+"""
+
+
+def safe_block_list(patterns=BLOCKED_URL_PATTERNS, keep=NEVER_BLOCK_KEYWORDS):
+    """보안/인증서 관련 키워드가 들어간 패턴을 뺀 차단 목록을 반환합니다."""
+    safe = []
+    for pattern in patterns:
+        lowered = pattern.lower()
+        if any(keyword in lowered for keyword in keep):
+            print(f"보안 리소스와 겹칠 수 있어 차단하지 않습니다: {pattern}")
+            continue
+        safe.append(pattern)
+    return safe
+
+
+def apply_blocked_urls(driver, patterns=BLOCKED_URL_PATTERNS):
+    """CDP로 차단 목록을 적용하고 실제로 적용한 패턴 목록을 반환합니다."""
+    blocked = safe_block_list(patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+    return blocked
+
+
+def page_timing(driver):
+    return driver.execute_script(PAGE_TIMING_SCRIPT)
+
+
+def record_page_timing(driver, label, lean, path):
+    """현재 문서의 로드 시간을 설정 사용 여부(lean)와 함께 JSONL로 추가합니다."""
+    try:
+        timing = page_timing(driver)
+    except Exception as e:
+        print(f"화면 로드 시간 기록 실패 ({label}): {e}")
+        return None
+    record = {'created': datetime.now().isoformat(timespec='seconds'), 'label': label, 'lean': lean, **timing}
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+def summarize_page_timings(path):
+    """(화면, 설정 사용 여부)별 로드 시간 중앙값을 계산합니다."""
+    groups = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                groups.setdefault((record['label'], record['lean']), []).append(record)
+    summary = {}
+    for key, records in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1])):
+        loads = [r['load_ms'] for r in records if r.get('load_ms')]
+        summary[key] = {
+            'runs': len(records),
+            'load_ms': statistics.median(loads) if loads else None,
+            'resources': statistics.median(r['resources'] for r in records),
+            'transfer_bytes': statistics.median(r['transfer_bytes'] for r in records),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가벼운 브라우저 설정 사용/미사용별 화면 로드 시간 비교")
+    parser.add_argument("path", nargs="?", default="page_timings.jsonl")
+    args = parser.parse_args()
+
+    print(f"{'화면':<20}{'설정':>6}{'실행':>6}{'load(ms)':>12}{'리소스':>8}{'전송(byte)':>14}")
+    for (label, lean), stats in summarize_page_timings(args.path).items():
+        load = f"{stats['load_ms']:.0f}" if stats['load_ms'] is not None else "-"
+        print(f"{label:<20}{'on' if lean else 'off':>6}{stats['runs']:>6}{load:>12}"
+              f"{stats['resources']:>8.0f}{stats['transfer_bytes']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
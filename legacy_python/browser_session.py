@@ -0,0 +1,99 @@
+"""원격 디버깅 포트로 이미 떠 있는 Chrome에 붙고, 하나은행 로그인 세션이 살아 있는지 확인하는 함수 모음"""
+import os
+import shutil
+import subprocess
+import time
+import urllib.request
+
+DEBUG_HOST = "127.0.0.1"
+
+# 로그인된 상태에서만 보이는 요소 (기본 문서 또는 메인 프레임에서 찾음)
+LOGGED_IN_XPATH = "//a[contains(normalize-space(.), '로그아웃')]"
+
+# chrome.exe를 찾을 위치 (PATH에 없을 때)
+CHROME_CANDIDATES = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    os.path.join(os.environ.get("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe"),
+]
+
+
+def find_chrome():
+    for name in ("chrome", "google-chrome", "chrome.exe"):
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in CHROME_CANDIDATES:
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError("chrome.exe를 찾을 수 없습니다. CHROME_CANDIDATES에 경로를 추가해주세요.")
+
+
+def debugger_alive(port, timeout=0.5):
+    """원격 디버깅 포트에 응답하는 Chrome이 있는지 확인합니다."""
+    try:
+        with urllib.request.urlopen(f"http://{DEBUG_HOST}:{port}/json/version", timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def launch_chrome(port, user_data_dir, url=None, extra_args=(), timeout=15):
+    """전용 프로필로 원격 디버깅 포트를 연 Chrome을 띄웁니다. 스크립트가 끝나도 브라우저는 남습니다."""
+    os.makedirs(user_data_dir, exist_ok=True)
+    args = [find_chrome(), f"--remote-debugging-port={port}", f"--user-data-dir={user_data_dir}", *extra_args]
+    if url:
+        args.append(url)
+    subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if debugger_alive(port):
+            return True
+        time.sleep(0.2)
+    raise TimeoutError(f"{timeout}초 안에 Chrome 원격 디버깅 포트({port})가 열리지 않았습니다.")
+
+
+def attach_chrome(port, user_data_dir, extra_args=()):
+    """포트에 Chrome이 없으면 띄운 뒤 debuggerAddress로 연결한 드라이버를 반환합니다.
+
+    launched는 이번 실행에서 Chrome을 새로 띄웠는지 여부입니다.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    launched = False
+    if not debugger_alive(port):
+        print(f"실행 중인 Chrome이 없어 새로 띄웁니다. (포트 {port}, 프로필 {user_data_dir})")
+        launch_chrome(port, user_data_dir, extra_args=extra_args)
+        launched = True
+    options = Options()
+    options.add_experimental_option("debuggerAddress", f"{DEBUG_HOST}:{port}")
+    return webdriver.Chrome(options=options), launched
+
+
+def session_alive(driver, frame_id, host="kebhana.com", logged_in_xpath=LOGGED_IN_XPATH):
+    """열린 탭 중 host의 메인 프레임이 로그인 상태인 탭이 있으면 그 탭으로 전환하고 True를 반환합니다.
+
+    반환 시 드라이버는 기본 문서(default content)를 가리킵니다.
+    """
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+
+    for handle in driver.window_handles:
+        try:
+            driver.switch_to.window(handle)
+            if host not in driver.current_url:
+                continue
+            frames = driver.find_elements(By.ID, frame_id)
+            if not frames:
+                continue
+            if driver.find_elements(By.XPATH, logged_in_xpath):
+                return True
+            driver.switch_to.frame(frames[0])
+            alive = bool(driver.find_elements(By.XPATH, logged_in_xpath))
+            driver.switch_to.default_content()
+            if alive:
+                return True
+        except WebDriverException as e:
+            print(f"세션 확인 중 오류 (탭 건너뜀): {e.msg}")
+    return False
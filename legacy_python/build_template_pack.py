@@ -0,0 +1,69 @@
+"""src 폴더의 템플릿 PNG를 하나의 템플릿 팩(.npy + .json)으로 묶는 빌드 스크립트
+
+    python build_template_pack.py [--img-dir 경로] [--output 경로]
+
+3. 이체집행.py는 팩이 있으면 PNG를 디코딩하지 않고 np.load(mmap_mode='r')로 읽습니다.
+PNG가 팩보다 새로 수정되면 해당 이미지만 PNG에서 다시 읽으므로, 이미지를 바꾼 뒤 다시 실행하세요.
+"""
+import argparse
+import glob
+import json
+import os
+
+import cv2
+import numpy as np
+
+from image_locator import pack_key, split_alpha
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_pack(img_dir, output):
+    """폴더의 모든 PNG를 회색조/컬러/마스크 평면으로 나눠 하나의 배열에 이어 붙입니다."""
+    paths = sorted(set(glob.glob(os.path.join(img_dir, "*.png")) + glob.glob(os.path.join(img_dir, "*.PNG"))))
+    if not paths:
+        raise ValueError(f"템플릿 이미지를 찾을 수 없습니다: {img_dir}")
+
+    chunks = []
+    offset = 0
+    manifest = {}
+
+    def add(array):
+        nonlocal offset
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        entry = [offset, list(array.shape)]
+        chunks.append(array.ravel())
+        offset += array.size
+        return entry
+
+    for path in paths:
+        image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            print(f"이미지를 읽을 수 없어 건너뜁니다: {path}")
+            continue
+        bgr, mask = split_alpha(image)
+        name = os.path.basename(path)
+        manifest[pack_key(name)] = {
+            'mtime': os.path.getmtime(path),
+            'width': bgr.shape[1],
+            'height': bgr.shape[0],
+            'bgr': add(bgr),
+            'gray': add(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)),
+            'mask': add(mask) if mask is not None else None,
+        }
+        print(f"{name}: {bgr.shape[1]}x{bgr.shape[0]}{' (마스크)' if mask is not None else ''}")
+
+    np.save(output, np.concatenate(chunks))
+    manifest_path = os.path.splitext(output)[0] + ".json"
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'templates': manifest}, f, ensure_ascii=False, indent=2)
+    print(f"템플릿 {len(manifest)}개를 {output}에 저장했습니다. ({offset} bytes)")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="템플릿 팩 빌드")
+    parser.add_argument("--img-dir", default=os.path.join(script_dir, "src"))
+    parser.add_argument("--output", default=None, help="기본값: <img-dir>/templates_pack.npy")
+    args = parser.parse_args()
+    build_pack(args.img_dir, args.output or os.path.join(args.img_dir, "templates_pack.npy"))
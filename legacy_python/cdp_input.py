@@ -0,0 +1,85 @@
+"""Chrome DevTools Protocol(Input.dispatchKeyEvent)로 키 입력을 보내는 입력 엔진
+
+pyautogui와 달리 OS 포커스가 필요 없고, 마우스를 건드려도 입력이 끊기지 않습니다.
+"""
+import re
+import time as tm
+
+
+def key_event_params(char):
+    """문자 하나에 대한 keyDown/keyUp 공통 파라미터를 만듭니다."""
+    if char.isdigit():
+        code = f"Digit{char}"
+        key_code = ord(char)
+    elif char.isalpha() and char.isascii():
+        code = f"Key{char.upper()}"
+        key_code = ord(char.upper())
+    else:
+        code = ""
+        key_code = 0
+    return {
+        'key': char,
+        'code': code,
+        'windowsVirtualKeyCode': key_code,
+        'nativeVirtualKeyCode': key_code,
+    }
+
+
+def dispatch_text(driver, text, delay=0.0):
+    """현재 포커스된 요소에 text를 한 글자씩 키 이벤트로 보냅니다."""
+    for char in str(text):
+        params = key_event_params(char)
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(params, type="keyDown", text=char))
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(params, type="keyUp"))
+        if delay:
+            tm.sleep(delay)
+
+
+def read_value(driver, element):
+    return driver.execute_script("return arguments[0].value;", element) or ""
+
+
+# 보안 키패드(TransKey) 필드인지 확인하는 스크립트. 이런 필드의 실제 값은 화면 칸이 아니라
+# 옆의 숨은 cipher_<id> 필드에 암호화되어 들어가므로 화면 값으로는 입력 결과를 확인할 수 없음
+TRANSKEY_FIELD_SCRIPT = """
+var el = arguments[0];
+if (!el || !el.id) { return false; }
+if (document.getElementById('cipher_' + el.id) || document.getElementById('Tk_' + el.id + '_check')) { return true; }
+var inputs = document.getElementById('transkey_inputs');
+return !!inputs && (',' + inputs.value + ',').indexOf(':' + el.id + ',') >= 0;
+"""
+
+
+def is_transkey_field(driver, element):
+    """element가 보안 키패드(TransKey) 필드인지 확인합니다."""
+    return bool(driver.execute_script(TRANSKEY_FIELD_SCRIPT, element))
+
+
+def value_matches(value, text):
+    """입력 결과가 text와 같은지 확인합니다. 쉼표 서식과 전체가 가려진 마스킹(****)은 허용합니다."""
+    normalized = re.sub(r"[,\s\-]", "", value)
+    text = str(text)
+    if normalized == text:
+        return True
+    # 키보드 보안 필드는 실제 값 대신 같은 길이의 마스킹 문자를 보여줌 ("12**"처럼 일부만 가려진 값은 불일치)
+    return len(normalized) == len(text) and not any(char.isalnum() for char in normalized)
+
+
+def type_with_cdp(driver, element, text, delay=0.0):
+    """element에 CDP 키 이벤트로 text를 입력하고 결과를 확인합니다.
+
+    값이 맞지 않으면 필드를 비우고 False를 반환합니다 (호출한 쪽에서 다른 방식으로 재입력).
+    화면 값만 비우므로 TransKey 필드(is_transkey_field)에는 쓰지 않습니다.
+    """
+    driver.execute_script("arguments[0].focus();", element)
+    dispatch_text(driver, text, delay)
+    value = read_value(driver, element)
+    if value_matches(value, text):
+        return True
+    print(f"CDP 입력 결과가 다릅니다 (기대값: {text}, 실제값: {value})")
+    driver.execute_script(
+        "arguments[0].value = '';"
+        "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+        element,
+    )
+    return False
@@ -0,0 +1,111 @@
+"""이체 흐름의 조건 대기 함수와 단계별 대기/작업 시간(sleep budget) 측정"""
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class SleepBudget:
+    """단계별로 전체 시간과 그중 대기한 시간을 기록합니다.
+
+    mark(이름)으로 새 단계를 시작하면 이전 단계가 끝난 것으로 봅니다.
+    대기 시간은 waiting()/sleep()/add_wait()로 현재 단계에 더해집니다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.steps = []
+        self.current = None
+
+    def mark(self, name):
+        now = self.clock()
+        if self.current is not None:
+            self.current['end'] = now
+        self.current = {'name': name, 'start': now, 'end': None, 'wait': 0.0, 'waits': {}}
+        self.steps.append(self.current)
+        return self.current
+
+    def add_wait(self, label, seconds):
+        if self.current is None:
+            self.mark("시작")
+        self.current['wait'] += seconds
+        self.current['waits'][label] = self.current['waits'].get(label, 0.0) + seconds
+
+    @contextmanager
+    def waiting(self, label):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add_wait(label, self.clock() - start)
+
+    def sleep(self, seconds, label="sleep"):
+        """고정 대기. 남아 있는 고정 대기도 보고서에 드러나도록 기록합니다."""
+        with self.waiting(label):
+            time.sleep(seconds)
+
+    def summary(self):
+        """단계 이름별 {'seconds', 'wait', 'work', 'waits'}를 처음 나온 순서대로 반환합니다."""
+        now = self.clock()
+        summary = {}
+        for step in self.steps:
+            end = step['end'] if step['end'] is not None else now
+            entry = summary.setdefault(step['name'], {'seconds': 0.0, 'wait': 0.0, 'work': 0.0, 'waits': {}})
+            entry['seconds'] += end - step['start']
+            entry['wait'] += step['wait']
+            entry['work'] += max(end - step['start'] - step['wait'], 0.0)
+            for label, seconds in step['waits'].items():
+                entry['waits'][label] = entry['waits'].get(label, 0.0) + seconds
+        return summary
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return summary
+        print(f"\n{'단계':<20}{'전체(초)':>10}{'대기(초)':>10}{'작업(초)':>10}  대기 내역")
+        for name, entry in summary.items():
+            waits = ", ".join(f"{label} {seconds:.1f}" for label, seconds in entry['waits'].items())
+            print(f"{name:<20}{entry['seconds']:>10.1f}{entry['wait']:>10.1f}{entry['work']:>10.1f}  {waits}")
+        total = sum(entry['seconds'] for entry in summary.values())
+        waited = sum(entry['wait'] for entry in summary.values())
+        print(f"{'합계':<20}{total:>10.1f}{waited:>10.1f}{total - waited:>10.1f}")
+        return summary
+
+    def dump(self, path):
+        """보고서를 출력하고 실행 한 번을 JSONL 한 줄로 추가합니다."""
+        summary = self.report()
+        if not summary:
+            return
+        with open(path, 'a', encoding='utf-8') as f:
+            record = {'created': datetime.now().isoformat(timespec='seconds'), 'steps': summary}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def wait_for(driver, condition, timeout, budget=None, label="wait", poll=0.1):
+    """WebDriverWait로 condition이 참이 될 때까지 기다리고 대기 시간을 budget에 기록합니다."""
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    waiter = WebDriverWait(driver, timeout, poll_frequency=poll)
+    if budget is None:
+        return waiter.until(condition)
+    with budget.waiting(label):
+        return waiter.until(condition)
+
+
+def wait_page_change(driver, element, timeout, ready_timeout, budget=None, label="page_change"):
+    """element가 사라질 때(화면 전환)까지 최대 timeout초 기다린 뒤 문서 로드 완료를 기다립니다.
+
+    화면 일부만 다시 그려져 element가 남아 있으면 전환 대기는 건너뜁니다.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+
+    try:
+        wait_for(driver, EC.staleness_of(element), timeout, budget, label)
+    except TimeoutException:
+        pass
+    return wait_for(driver, document_ready, ready_timeout, budget, label)
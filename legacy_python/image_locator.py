@@ -0,0 +1,644 @@
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+MATCH_THRESHOLD = 0.98
+
+
+def pack_key(image_path):
+    """템플릿 팩에서 쓰는 이미지 이름 (Windows 파일 이름처럼 대소문자 구분 없음)"""
+    return os.path.basename(image_path).lower()
+
+
+class TemplateRegistry:
+    """COORDS의 템플릿 이미지를 한 번만 디코딩해 보관하는 레지스트리"""
+
+    def __init__(self, img_dir, coords, scales=(1.0,), pack_path=None):
+        self.img_dir = img_dir
+        self.coords = coords
+        # DPI 배율(125%, 150%)이나 브라우저 확대에 대응하기 위해 미리 만들어 둘 배율
+        self.scales = tuple(dict.fromkeys((1.0,) + tuple(scales)))
+        self._templates = {}
+        # build_template_pack.py로 만든 템플릿 팩 (있으면 PNG 디코딩 없이 사용)
+        self._pack = None
+        self._pack_manifest = {}
+        if pack_path and os.path.exists(pack_path):
+            self._load_pack(pack_path)
+        # 시작 시 COORDS의 모든 이미지를 미리 디코딩
+        for image_path in sorted(set(coords.values())):
+            try:
+                self.get(image_path)
+            except ValueError as e:
+                print(e)
+
+    def get_image_path(self, image_path):
+        path = os.path.join(self.img_dir, image_path)
+        return os.path.normpath(path)
+
+    def get(self, image_path):
+        """템플릿 정보를 반환합니다. 파일 수정시간이 바뀌면 다시 디코딩합니다."""
+        full_path = self.get_image_path(image_path)
+        try:
+            mtime = os.path.getmtime(full_path)
+        except OSError:
+            mtime = None
+
+        template = self._templates.get(image_path)
+        if template is not None and template['mtime'] == mtime:
+            return template
+
+        packed = self._pack_manifest.get(pack_key(image_path))
+        if packed and (mtime is None or packed['mtime'] == mtime):
+            template = self._load_packed(packed)
+        elif mtime is None:
+            raise ValueError(f"이미지를 찾을 수 없습니다: {full_path}")
+        else:
+            template = self._load(full_path)
+        template['name'] = image_path
+        template['path'] = full_path
+        template['mtime'] = mtime
+        self._templates[image_path] = template
+        return template
+
+    def _load(self, full_path):
+        # cv2.imread 대신 numpy를 사용하여 이미지 로드 (한글 경로 대응)
+        image = cv2.imdecode(np.fromfile(full_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"이미지를 찾을 수 없습니다: {full_path}")
+        bgr, mask = split_alpha(image)
+        return self._with_scales(build_template(bgr, mask=mask))
+
+    def _load_pack(self, pack_path):
+        manifest_path = os.path.splitext(pack_path)[0] + ".json"
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                # 디스크의 파일 이름은 대소문자가 COORDS와 다를 수 있으므로(key_g.PNG) 소문자 키로 찾는다
+                self._pack_manifest = {
+                    pack_key(name): entry for name, entry in json.load(f)['templates'].items()
+                }
+            # 메모리 맵으로 열어 필요한 부분만 읽는다
+            self._pack = np.load(pack_path, mmap_mode='r')
+        except (OSError, ValueError, KeyError) as e:
+            print(f"템플릿 팩을 읽을 수 없습니다: {e}")
+            self._pack_manifest = {}
+            self._pack = None
+
+    def _pack_array(self, entry):
+        if entry is None:
+            return None
+        offset, shape = entry
+        size = int(np.prod(shape))
+        return self._pack[offset:offset + size].reshape(shape)
+
+    def _load_packed(self, packed):
+        bgr = self._pack_array(packed['bgr'])
+        gray = self._pack_array(packed['gray'])
+        mask = self._pack_array(packed.get('mask'))
+        return self._with_scales(build_template(bgr, gray=gray, mask=mask))
+
+    def _with_scales(self, template):
+        # 배율별 템플릿 (1.0은 원본 자신)
+        template['scales'] = {1.0: template}
+        height, width = template['height'], template['width']
+        for scale in self.scales:
+            if scale == 1.0:
+                continue
+            size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            mask = template['mask']
+            if mask is not None:
+                mask = cv2.resize(mask, size, interpolation=cv2.INTER_NEAREST)
+            template['scales'][scale] = build_template(
+                cv2.resize(template['bgr'], size, interpolation=interpolation), mask=mask
+            )
+        return template
+
+
+def split_alpha(image):
+    """이미지를 BGR과 알파 마스크로 나눕니다. 투명한 픽셀이 없으면 마스크는 None입니다."""
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), None
+    if image.shape[2] == 4:
+        alpha = image[..., 3]
+        mask = None
+        if (alpha < 255).any():
+            mask = np.where(alpha > 0, 255, 0).astype(np.uint8)
+        return np.ascontiguousarray(image[..., :3]), mask
+    return image, None
+
+
+def build_template(bgr, gray=None, mask=None):
+    """BGR 이미지로 매칭에 필요한 템플릿 정보를 만듭니다."""
+    height, width = bgr.shape[:2]
+    if gray is None:
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    return {
+        'bgr': bgr,
+        # 캡처 버퍼(BGRA)에 변환 없이 바로 매칭하기 위한 4채널 템플릿
+        'bgra': cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA),
+        'gray': gray,
+        # 투명한 모서리를 무시하기 위한 마스크 (없으면 None)
+        'mask': mask,
+        'width': width,
+        'height': height,
+        'center': (width // 2, height // 2),
+        # 피라미드 매칭용 축소 템플릿 캐시 (factor, 채널수) -> 배열
+        'pyramid': {},
+    }
+
+
+def template_plane(template, screen):
+    """화면 버퍼의 채널 수에 맞는 템플릿 배열을 고릅니다."""
+    if screen.ndim == 2:
+        return template['gray']
+    if screen.shape[2] == 4:
+        return template['bgra']
+    return template['bgr']
+
+
+def match_template(screen, template, threshold=MATCH_THRESHOLD, pyramid=None):
+    """화면(BGRA/BGR/gray)에서 템플릿을 찾아 중심 좌표를 반환합니다."""
+    return match_template_scored(screen, template, threshold, pyramid)[0]
+
+
+def match_template_scored(screen, template, threshold=MATCH_THRESHOLD, pyramid=None):
+    """match_template과 같지만 (중심 좌표 또는 None, 최고 일치율)을 반환합니다."""
+    mask = template['mask']
+    # 마스크 템플릿은 축소 시 경계가 흐려지므로 원본 해상도로만 매칭
+    if pyramid and pyramid > 1 and mask is None:
+        return match_template_pyramid(screen, template, pyramid, threshold)
+
+    plane = template_plane(template, screen)
+    if screen.shape[0] < plane.shape[0] or screen.shape[1] < plane.shape[1]:
+        return None, 0.0
+
+    if mask is None:
+        result = cv2.matchTemplate(screen, plane, cv2.TM_CCOEFF_NORMED)
+    else:
+        result = cv2.matchTemplate(screen, plane, cv2.TM_CCOEFF_NORMED, mask=mask)
+        # 마스크 매칭은 평탄한 영역에서 inf/nan이 나올 수 있음
+        result[~np.isfinite(result)] = 0
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    if max_val >= threshold:
+        return (max_loc[0] + template['center'][0], max_loc[1] + template['center'][1]), max_val
+    return None, max_val
+
+
+# 축소 후 템플릿이 이보다 작으면 후보 검출이 불안정하므로 원본 크기로 매칭
+PYRAMID_MIN_TEMPLATE_SIZE = 8
+
+
+def match_template_pyramid(screen, template, factor=2, threshold=MATCH_THRESHOLD,
+                           max_candidates=5, coarse_threshold=0.5):
+    """축소된 화면에서 후보를 찾고 후보 주변만 원본 해상도로 다시 매칭합니다.
+
+    (중심 좌표 또는 None, 원본 해상도에서의 최고 일치율)을 반환합니다.
+    """
+    plane = template_plane(template, screen)
+    t_height, t_width = plane.shape[:2]
+    if (t_width // factor < PYRAMID_MIN_TEMPLATE_SIZE
+            or t_height // factor < PYRAMID_MIN_TEMPLATE_SIZE
+            or screen.shape[1] // factor < t_width // factor
+            or screen.shape[0] // factor < t_height // factor):
+        return match_template_scored(screen, template, threshold)
+
+    key = (factor, plane.ndim if plane.ndim == 2 else plane.shape[2])
+    small_plane = template['pyramid'].get(key)
+    if small_plane is None:
+        small_plane = cv2.resize(plane, (t_width // factor, t_height // factor),
+                                 interpolation=cv2.INTER_AREA)
+        template['pyramid'][key] = small_plane
+    small_screen = cv2.resize(screen, (screen.shape[1] // factor, screen.shape[0] // factor),
+                              interpolation=cv2.INTER_AREA)
+
+    result = cv2.matchTemplate(small_screen, small_plane, cv2.TM_CCOEFF_NORMED)
+    # 후보 주변 여백 (축소로 인한 위치 오차 보정)
+    margin = 2 * factor
+    # 원본 해상도까지 가지 못한 경우 텔레메트리에는 축소 화면의 최고 점수를 남긴다
+    best_score = float(cv2.minMaxLoc(result)[1])
+    refined_score = None
+    for _ in range(max_candidates):
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        # 작은 UI 이미지는 축소 시 홀수 좌표에 있으면 점수가 0.5~0.7까지 떨어지므로
+        # 후보 기준은 낮게 두고 최종 판단은 원본 해상도의 threshold로 한다
+        if max_val < coarse_threshold:
+            break
+
+        # 원본 해상도에서 후보 주변 창만 다시 매칭
+        left = max(max_loc[0] * factor - margin, 0)
+        top = max(max_loc[1] * factor - margin, 0)
+        right = min(max_loc[0] * factor + t_width + margin, screen.shape[1])
+        bottom = min(max_loc[1] * factor + t_height + margin, screen.shape[0])
+        location, score = match_template_scored(screen[top:bottom, left:right], template, threshold)
+        refined_score = score if refined_score is None else max(refined_score, score)
+        if location:
+            return (location[0] + left, location[1] + top), score
+
+        # 같은 후보가 다시 선택되지 않도록 주변 점수를 지운다
+        x, y = max_loc
+        result[max(y - small_plane.shape[0] // 2, 0):y + small_plane.shape[0] // 2 + 1,
+               max(x - small_plane.shape[1] // 2, 0):x + small_plane.shape[1] // 2 + 1] = -1.0
+    return None, best_score if refined_score is None else refined_score
+
+
+class MatchTelemetry:
+    """매칭 시도마다 일치율, 모니터, 배율, 소요시간을 링 버퍼에 기록하는 텔레메트리"""
+
+    def __init__(self, maxlen=10000):
+        self.records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, template, score, threshold, monitor, scale, seconds):
+        with self._lock:
+            self.records.append({
+                'time': time.time(),
+                'template': template,
+                'score': round(float(score), 4),
+                'threshold': threshold,
+                'hit': score >= threshold,
+                'monitor': monitor,
+                'scale': scale,
+                'ms': round(seconds * 1000, 2),
+            })
+
+    def dump(self, path):
+        """기록을 JSONL 파일 끝에 추가하고 버퍼를 비웁니다."""
+        with self._lock:
+            records = list(self.records)
+            self.records.clear()
+        if not records:
+            return 0
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(records)
+
+
+def load_telemetry(path):
+    """dump()로 저장한 JSONL 기록을 읽습니다."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def learn_thresholds(records, floor=0.9, ceiling=MATCH_THRESHOLD, margin=0.02, min_samples=5, floors=None):
+    """템플릿별 일치율 분포로 임계값 표를 만듭니다.
+
+    기본 임계값(ceiling) 이상으로 맞아 실제로 클릭에 쓰인 시도만 '화면에 있던' 점수로 보고
+    그 하위 1%에서 margin을 뺀 값을 임계값으로 하되, 나머지 점수(비슷한 모양의 다른 버튼 포함)의
+    최댓값보다는 margin만큼 높게 유지합니다. floors({템플릿: 최저 임계값})로 템플릿별 하한을 줍니다.
+    """
+    present = {}
+    others = {}
+    for record in records:
+        # 낮춘 임계값으로 맞은 기록은 임계값을 더 낮추는 근거로 쓰지 않는다
+        confirmed = record['hit'] and record['threshold'] >= ceiling
+        (present if confirmed else others).setdefault(record['template'], []).append(record['score'])
+
+    floors = floors or {}
+    thresholds = {}
+    for template, values in present.items():
+        if len(values) < min_samples:
+            continue
+        threshold = float(np.percentile(values, 1)) - margin
+        if template in others:
+            threshold = max(threshold, max(others[template]) + margin)
+        threshold = max(threshold, floor, floors.get(template, floor))
+        thresholds[template] = round(min(threshold, ceiling), 4)
+    return thresholds
+
+
+class LocationHints:
+    """템플릿별 마지막 발견 위치를 JSON으로 저장하는 힌트 캐시"""
+
+    def __init__(self, path, padding=48):
+        self.path = path
+        self.padding = padding
+        self.counters = {'roi': 0, 'monitor': 0, 'full': 0, 'miss': 0}
+        self._hints = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._hints = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"위치 힌트 파일을 읽을 수 없습니다: {e}")
+
+    def get(self, image_path):
+        return self._hints.get(image_path)
+
+    def record(self, image_path, location, monitor_number):
+        hint = {'x': location[0], 'y': location[1], 'monitor': monitor_number}
+        with self._lock:
+            if self._hints.get(image_path) != hint:
+                self._hints[image_path] = hint
+                self.save()
+
+    def count(self, kind):
+        with self._lock:
+            self.counters[kind] += 1
+
+    def save(self):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._hints, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"위치 힌트 파일을 저장할 수 없습니다: {e}")
+
+    def roi(self, hint, template, monitor):
+        """마지막 위치 주변에 여백을 둔 탐색 영역을 모니터 범위 안으로 잘라 반환합니다."""
+        left = max(hint['x'] - template['center'][0] - self.padding, monitor['left'])
+        top = max(hint['y'] - template['center'][1] - self.padding, monitor['top'])
+        right = min(left + template['width'] + 2 * self.padding, monitor['left'] + monitor['width'])
+        bottom = min(top + template['height'] + 2 * self.padding, monitor['top'] + monitor['height'])
+        return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+
+    def stats(self):
+        """적중/실패 카운터와 적중률을 반환합니다."""
+        total = sum(self.counters.values())
+        hit_rate = self.counters['roi'] / total if total else 0.0
+        return dict(self.counters, total=total, roi_hit_rate=hit_rate)
+
+
+class ScreenWatcher:
+    """축소 샘플의 해시로 영역별 화면 변화를 저비용으로 감지하는 감시기"""
+
+    def __init__(self, session, regions, step=8):
+        self.session = session
+        # 감시할 영역 (모니터 전체 또는 힌트 주변의 작은 영역)
+        self.regions = regions
+        # step 픽셀 간격으로 샘플링 (복사 없는 strided 뷰)
+        self.step = step
+        self._signatures = {}
+
+    def signature(self, pixels):
+        return zlib.crc32(pixels[::self.step, ::self.step].tobytes())
+
+    def changed(self, frame=None):
+        """이전 호출 이후 화면이 바뀐 영역 목록을 반환합니다.
+
+        frame이 없으면 데스크톱 전체 대신 감시 영역만 캡처합니다.
+        """
+        changed = []
+        for index, region in enumerate(self.regions):
+            if frame is None:
+                pixels = self.session.grab_region(region)
+            else:
+                pixels = self.session.view(region, frame)
+            signature = self.signature(pixels)
+            if self._signatures.get(index) != signature:
+                self._signatures[index] = signature
+                changed.append(region)
+        return changed
+
+
+# 이보다 높은 모니터는 가로 띠(타일)로 나눠 병렬로 매칭
+TILE_HEIGHT = 1080
+
+
+def split_tiles(region, template_height, tile_height=TILE_HEIGHT):
+    """큰 영역을 템플릿 높이만큼 겹치는 가로 띠로 나눕니다."""
+    if not tile_height or region['height'] <= tile_height:
+        return [region]
+    tiles = []
+    for offset in range(0, region['height'], tile_height):
+        height = min(tile_height + template_height - 1, region['height'] - offset)
+        if height < template_height:
+            break
+        tiles.append({
+            'left': region['left'],
+            'top': region['top'] + offset,
+            'width': region['width'],
+            'height': height,
+        })
+    return tiles
+
+
+class ImageLocator:
+    """템플릿 레지스트리, 캡처 세션, 위치 힌트를 묶어 화면에서 이미지를 찾는 탐색기"""
+
+    def __init__(self, registry, session, monitors=None, hints=None, pyramid=None,
+                 workers=None, tile_height=TILE_HEIGHT, telemetry=None, thresholds=None):
+        self.registry = registry
+        # session은 screen_sources.ScreenSource (실제 화면, 녹화 프레임, 합성 화면)
+        self.session = session
+        self.monitors = monitors if monitors is not None else session.monitors()
+        self.hints = hints
+        # 모니터 전체를 탐색할 때 사용할 피라미드 축소 배율 (None, 2, 4)
+        self.pyramid = pyramid
+        # 모니터/타일 병렬 매칭 스레드 수 (기본값: CPU 코어 수)
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_height = tile_height
+        self.telemetry = telemetry
+        # 템플릿별 임계값 표 (없는 템플릿은 MATCH_THRESHOLD 사용)
+        self.thresholds = thresholds or {}
+        self._frame = None
+        self._frame_time = 0.0
+        self._executor = None
+        self._match_executor = None
+        # 마지막으로 성공한 배율을 앞에 두는 탐색 순서와 모니터별 확정 배율
+        self._scale_order = list(registry.scales)
+        self._monitor_scales = {}
+
+    def grab(self, max_age_ms=0):
+        """화면을 캡처합니다. max_age_ms 이내에 캡처한 프레임이 있으면 재사용합니다."""
+        now = time.monotonic()
+        if self._frame is None or (now - self._frame_time) * 1000 > max_age_ms:
+            self._frame = self.session.grab()
+            self._frame_time = now
+        return self._frame
+
+    def locate_many(self, image_paths, max_age_ms=0):
+        """한 번 캡처한 화면에서 여러 템플릿을 동시에 찾아 {이미지: 위치}로 반환합니다."""
+        frame = self.grab(max_age_ms)
+        image_paths = list(dict.fromkeys(image_paths))  # 중복 제거, 순서 유지
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="locate")
+        # cv2.matchTemplate는 GIL을 해제하므로 스레드로 병렬 매칭
+        locations = self._executor.map(lambda path: self.locate(path, frame), image_paths)
+        return dict(zip(image_paths, locations))
+
+    def wait_for(self, image_path, timeout=20, poll_interval=0.05, full_interval=1.0):
+        """화면이 바뀔 때만 매칭을 다시 실행하며 이미지가 나타날 때까지 기다립니다.
+
+        매 주기에는 감시 영역만 캡처해 비교하고, 변화가 감지되거나 full_interval초가
+        지났을 때만 데스크톱 전체를 캡처해 매칭합니다.
+        """
+        watcher = ScreenWatcher(self.session, self.watch_regions(image_path))
+        deadline = time.monotonic() + timeout
+        next_full = 0.0
+        while True:
+            if watcher.changed() or time.monotonic() >= next_full:
+                location = self.locate(image_path, self.grab())
+                if location:
+                    return location
+                next_full = time.monotonic() + full_interval
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def watch_regions(self, image_path):
+        """wait_for가 감시할 영역. 힌트가 있으면 힌트 주변만, 없으면 모니터별 전체 영역."""
+        hint = self.hints.get(image_path) if self.hints else None
+        monitor = self._monitor(hint['monitor']) if hint else None
+        if monitor is None:
+            return list(self.monitors)
+        # 힌트 밖(다른 모니터, 창 이동)에 나타난 경우는 full_interval마다 하는 전체 매칭이 잡는다
+        template = self.registry.get(image_path)
+        scale = self._scales_for(template, monitor)[0]
+        return [self.hints.roi(hint, template['scales'][scale], monitor)]
+
+    def wait_settle(self, region=None, quiet=0.3, timeout=5, poll_interval=0.05,
+                    step=8, tolerance=0.001):
+        """영역이 quiet초 동안 변하지 않을 때까지 기다리고 걸린 시간(초)을 반환합니다."""
+        regions = [region] if region else self.monitors
+        start = time.monotonic()
+        previous = None
+        stable_since = start
+        while True:
+            # 데스크톱 전체가 아니라 지켜볼 영역만 캡처하고,
+            # 축소 샘플을 비교해 커서 깜빡임 같은 작은 변화는 무시
+            samples = [self.session.grab_region(r)[::step, ::step].astype(np.int16) for r in regions]
+            now = time.monotonic()
+            if previous is not None:
+                changed = sum(np.count_nonzero(np.abs(a - b) > 16) for a, b in zip(samples, previous))
+                total = sum(a.size for a in samples)
+                if changed > total * tolerance:
+                    stable_since = now
+            previous = samples
+            if now - stable_since >= quiet or now - start >= timeout:
+                return now - start
+            time.sleep(poll_interval)
+
+    def monitor_at(self, location):
+        """좌표가 속한 모니터를 반환합니다."""
+        for monitor in self.monitors:
+            if (monitor['left'] <= location[0] < monitor['left'] + monitor['width']
+                    and monitor['top'] <= location[1] < monitor['top'] + monitor['height']):
+                return monitor
+        return None
+
+    def locate(self, image_path, frame=None):
+        """힌트 영역 → 마지막 모니터 → 전체 모니터 순서로 이미지를 찾습니다."""
+        template = self.registry.get(image_path)
+        if frame is None:
+            frame = self.session.grab()
+
+        hint = self.hints.get(image_path) if self.hints else None
+        hint_monitor = None
+        if hint:
+            hint_monitor = self._monitor(hint['monitor'])
+        if hint_monitor:
+            scales = self._scales_for(template, hint_monitor)
+            region = self.hints.roi(hint, template['scales'][scales[0]], hint_monitor)
+            location, scale = self._match_region(frame, region, template, None, scales, hint_monitor)
+            if location:
+                return self._hit('roi', image_path, location, hint_monitor, scale)
+            location, _, scale = self._match_regions(frame, [hint_monitor], template)
+            if location:
+                return self._hit('monitor', image_path, location, hint_monitor, scale)
+
+        monitors = [monitor for monitor in self.monitors if monitor is not hint_monitor]
+        location, monitor, scale = self._match_regions(frame, monitors, template)
+        if location:
+            return self._hit('full', image_path, location, monitor, scale)
+
+        if self.hints:
+            self.hints.count('miss')
+        return None
+
+    def locate_on_monitor(self, image_path, monitor, frame=None):
+        """단일 모니터에서 이미지를 찾습니다."""
+        if frame is None:
+            frame = self.session.grab()
+        location, _, _ = self._match_regions(frame, [monitor], self.registry.get(image_path))
+        return location
+
+    def reset_scales(self):
+        """모니터별로 기억한 배율을 지웁니다 (DPI나 확대 비율을 바꾼 경우)."""
+        self._monitor_scales.clear()
+
+    def _monitor(self, number):
+        for monitor in self.monitors:
+            if monitor['number'] == number:
+                return monitor
+        return None
+
+    def _scales_for(self, template, monitor):
+        """모니터에서 시도할 배율 목록 (확정된 배율을 먼저, 못 찾으면 나머지 배율 순서대로)"""
+        pinned = self._monitor_scales.get(monitor['number'])
+        scales = [scale for scale in self._scale_order if scale in template['scales'] and scale != pinned]
+        if pinned in template['scales']:
+            return [pinned] + scales
+        return scales
+
+    def _match_region(self, frame, region, template, pyramid, scales, monitor=None):
+        screen = self.session.view(region, frame)
+        name = template['name']
+        threshold = self.thresholds.get(name, MATCH_THRESHOLD)
+        for scale in scales:
+            start = time.perf_counter()
+            location, score = match_template_scored(screen, template['scales'][scale], threshold, pyramid)
+            if self.telemetry:
+                self.telemetry.record(name, score, threshold, monitor['number'] if monitor else None,
+                                      scale, time.perf_counter() - start)
+            if location:
+                return (location[0] + region['left'], location[1] + region['top']), scale
+        return None, None
+
+    def _match_regions(self, frame, monitors, template):
+        """모니터(큰 모니터는 타일)를 스레드 풀에서 동시에 매칭하고 먼저 찾은 결과를 반환합니다."""
+        max_height = max(variant['height'] for variant in template['scales'].values())
+        tasks = [
+            (monitor, tile, self._scales_for(template, monitor))
+            for monitor in monitors
+            for tile in split_tiles(monitor, max_height, self.tile_height)
+        ]
+        if self.workers <= 1 or len(tasks) <= 1:
+            for monitor, tile, scales in tasks:
+                location, scale = self._match_region(frame, tile, template, self.pyramid, scales, monitor)
+                if location:
+                    return location, monitor, scale
+            return None, None, None
+
+        if self._match_executor is None:
+            self._match_executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                      thread_name_prefix="match")
+        futures = {
+            self._match_executor.submit(self._match_region, frame, tile, template, self.pyramid,
+                                        scales, monitor): monitor
+            for monitor, tile, scales in tasks
+        }
+        try:
+            for future in as_completed(futures):
+                location, scale = future.result()
+                if location:
+                    return location, futures[future], scale
+        finally:
+            # 먼저 찾은 경우 아직 시작하지 않은 매칭은 취소
+            for future in futures:
+                future.cancel()
+        return None, None, None
+
+    def _hit(self, kind, image_path, location, monitor, scale=1.0):
+        # 찾은 배율을 모니터별로 기억하고 다음 탐색 순서의 맨 앞으로 올린다
+        self._monitor_scales[monitor['number']] = scale
+        if self._scale_order[0] != scale:
+            self._scale_order = [scale] + [s for s in self._scale_order if s != scale]
+        if self.hints:
+            self.hints.count(kind)
+            self.hints.record(image_path, location, monitor['number'])
+        return location
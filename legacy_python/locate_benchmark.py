@@ -0,0 +1,208 @@
+"""합성 화면으로 템플릿 매칭 속도와 정확도를 측정하는 벤치마크
+
+실제 모니터 없이 numpy와 OpenCV만으로 실행됩니다.
+
+    python locate_benchmark.py --trials 5 --output locate_benchmark.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from image_locator import ImageLocator, TemplateRegistry
+from screen_sources import SyntheticScreenSource
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# 모니터 배치 (가로로 나란히 배치)
+LAYOUTS = {
+    "1080p": [(1920, 1080)],
+    "1440p": [(2560, 1440)],
+    "4k": [(3840, 2160)],
+    "1080p+1440p": [(1920, 1080), (2560, 1440)],
+    "3x4k": [(3840, 2160)] * 3,
+}
+
+# 찾은 위치가 정답 중심에서 이 픽셀 이내면 정답으로 판단
+LOCATION_TOLERANCE = 4
+
+
+def default_img_dir():
+    # 3. 이체집행.py와 같은 src 폴더를 우선 사용하고, 없으면 저장소의 src/img_src 사용
+    img_dir = os.path.join(script_dir, "src")
+    if os.path.isdir(img_dir):
+        return img_dir
+    return os.path.normpath(os.path.join(script_dir, "..", "src", "img_src"))
+
+
+def list_templates(img_dir):
+    """폴더의 PNG 템플릿 파일명 목록 (COORDS에서 사용하는 이미지와 같음)"""
+    paths = glob.glob(os.path.join(img_dir, "*.png")) + glob.glob(os.path.join(img_dir, "*.PNG"))
+    return sorted(set(os.path.basename(path) for path in paths))
+
+
+def build_monitors(sizes):
+    monitors = []
+    left = 0
+    for number, (width, height) in enumerate(sizes, 1):
+        monitors.append({'top': 0, 'left': left, 'width': width, 'height': height, 'number': number})
+        left += width
+    return monitors
+
+
+def add_noise(frame, sigma, rng):
+    if not sigma:
+        return frame
+    noisy = frame.astype(np.int16)
+    noisy[..., :3] += rng.normal(0, sigma, frame[..., :3].shape).astype(np.int16)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+
+def timed_locate(locator, image_path, frame):
+    """한 번의 탐색 시간(초)과 할당 바이트(tracemalloc 최대치)를 측정합니다."""
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    location = locator.locate(image_path, frame)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return location, elapsed, max(peak - before, 0)
+
+
+def run_benchmark(img_dir, layouts, trials, noise_levels, paste_scales, registry_scales,
+                  pyramid=None, workers=None, seed=0):
+    rng = np.random.default_rng(seed)
+    names = list_templates(img_dir)
+    if not names:
+        raise ValueError(f"템플릿 이미지를 찾을 수 없습니다: {img_dir}")
+    registry = TemplateRegistry(img_dir, {name: name for name in names}, scales=registry_scales)
+
+    records = []
+    tracemalloc.start()
+    try:
+        for layout in layouts:
+            monitors = build_monitors(LAYOUTS[layout])
+            print(f"[{layout}] 모니터 {len(monitors)}개, 템플릿 {len(names)}개, 시도 {trials}회")
+            for trial in range(trials):
+                source = SyntheticScreenSource(monitors, seed=int(rng.integers(1 << 31)))
+                # 힌트 없이 매번 처음 찾는 상황을 측정
+                locator = ImageLocator(registry, source, pyramid=pyramid, workers=workers)
+                for name in names:
+                    template = registry.get(name)
+                    scale = float(rng.choice(paste_scales))
+                    sigma = float(rng.choice(noise_levels))
+                    image = template['bgr']
+                    if scale != 1.0:
+                        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+                    monitor = monitors[int(rng.integers(len(monitors)))]
+                    left = monitor['left'] + int(rng.integers(0, monitor['width'] - image.shape[1]))
+                    top = monitor['top'] + int(rng.integers(0, monitor['height'] - image.shape[0]))
+
+                    # 템플릿이 있는 화면 (놓치면 false negative)
+                    source.clear()
+                    center = source.paste(image, left, top, name)
+                    frame = add_noise(source.grab(), sigma, rng)
+                    location, elapsed, allocated = timed_locate(locator, name, frame)
+                    correct = location is not None and (
+                        abs(location[0] - center[0]) <= LOCATION_TOLERANCE * scale
+                        and abs(location[1] - center[1]) <= LOCATION_TOLERANCE * scale
+                    )
+                    records.append({
+                        'layout': layout, 'template': name, 'present': True,
+                        'scale': scale, 'noise': sigma, 'found': location is not None,
+                        'correct': correct, 'seconds': elapsed, 'bytes': allocated,
+                    })
+
+                    # 템플릿이 없는 화면 (찾으면 false positive)
+                    source.clear()
+                    frame = add_noise(source.grab(), sigma, rng)
+                    location, elapsed, allocated = timed_locate(locator, name, frame)
+                    records.append({
+                        'layout': layout, 'template': name, 'present': False,
+                        'scale': scale, 'noise': sigma, 'found': location is not None,
+                        'correct': location is None, 'seconds': elapsed, 'bytes': allocated,
+                    })
+    finally:
+        tracemalloc.stop()
+    return records
+
+
+def summarize(records, key):
+    """key('template' 또는 'layout')별 지연시간과 오검출률을 집계합니다."""
+    summary = {}
+    for value in sorted(set(record[key] for record in records)):
+        group = [record for record in records if record[key] == value]
+        present = [record for record in group if record['present']]
+        absent = [record for record in group if not record['present']]
+        seconds = [record['seconds'] for record in group]
+        false_negative = sum(1 for record in present if not record['found'])
+        # 엉뚱한 위치를 찾은 경우와 없는 화면에서 찾은 경우 모두 false positive
+        false_positive = (sum(1 for record in present if record['found'] and not record['correct'])
+                          + sum(1 for record in absent if record['found']))
+        summary[value] = {
+            'attempts': len(group),
+            'p50_ms': percentile(seconds, 50) * 1000,
+            'p95_ms': percentile(seconds, 95) * 1000,
+            'false_negative_rate': false_negative / len(present) if present else 0.0,
+            'false_positive_rate': false_positive / len(group) if group else 0.0,
+            'bytes_per_attempt': float(np.mean([record['bytes'] for record in group])),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="템플릿 매칭 벤치마크 (합성 화면)")
+    parser.add_argument("--img-dir", default=default_img_dir())
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--noise", nargs="+", type=float, default=[0.0, 2.0, 5.0])
+    parser.add_argument("--paste-scales", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--scales", nargs="+", type=float, default=[1.0],
+                        help="TemplateRegistry에 미리 만들어 둘 배율")
+    parser.add_argument("--pyramid", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(script_dir, "locate_benchmark.json"))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records = run_benchmark(args.img_dir, args.layouts, args.trials, args.noise,
+                            args.paste_scales, args.scales, args.pyramid, args.workers, args.seed)
+    by_template = summarize(records, 'template')
+    by_layout = summarize(records, 'layout')
+
+    result = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'params': vars(args),
+        'duration_seconds': time.perf_counter() - started,
+        'by_template': by_template,
+        'by_layout': by_layout,
+        'records': records,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'템플릿':<24}{'p50(ms)':>10}{'p95(ms)':>10}{'FN':>8}{'FP':>8}{'bytes':>14}")
+    for name, stats in by_template.items():
+        print(f"{name:<24}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+              f"{stats['false_negative_rate']:>8.2f}{stats['false_positive_rate']:>8.2f}"
+              f"{stats['bytes_per_attempt']:>14.0f}")
+    print(f"\n결과가 {args.output}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
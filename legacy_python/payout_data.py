@@ -0,0 +1,234 @@
+"""이체정보.xlsx의 이체 대상 행을 읽고 은행명/계좌번호를 표준화해 검증하는 함수 모음
+
+로그인과 동시에 백그라운드에서 준비할 수 있도록 3. 이체집행*.py에서 분리했습니다.
+"""
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# 은행 선택을 위한 맵핑
+BANK_OPTIONS = {
+    "하나은행": "081",
+    "경남은행": "039",
+    "광주은행": "034",
+    "국민은행": "004",
+    "기업은행": "003",
+    "농협": "011",
+    "iM뱅크(대구)": "031",
+    "도이치뱅크": "055",
+    "부산은행": "032",
+    "산업은행": "002",
+    "저축은행": "050",
+    "새마을금고": "045",
+    "수협은행": "007",
+    "신협": "048",
+    "신한은행": "088",
+    "우리은행": "020",
+    "우체국": "071",
+    "전북은행": "037",
+    "제주은행": "035",
+    "카카오뱅크": "090",
+    "케이뱅크": "089",
+    "한국씨티은행": "027", 
+    "BOA": "060",
+    "HSBC": "054",
+    "JP모간": "057",
+    "SC제일은행": "023",
+    "하나증권": "270",
+    "교보증권": "261",
+    "대신증권": "267",
+    "미래에셋증권": "238",
+    "DB금융투자": "279",
+    "유안타증권": "209",
+    "메리츠증권": "287",
+    "부국증권": "290",
+    "삼성증권": "240",
+    "신영증권": "291",
+    "신한투자증권": "278",
+    "NH투자증권": "247",
+    "유진증권": "280",
+    "키움증권": "264",
+    "하이투자증권": "262",
+    "한국투자": "243",
+    "한화투자증권": "269",
+    "KB증권": "218",
+    "LS증권": "265",
+    "현대차증권": "263",
+    "케이프증권": "292",
+    "SK증권": "266",
+    "산림조합": "064",
+    "중국공상은행": "062",
+    "중국은행": "063",
+    "중국건설은행": "067",
+    "BNP파리바은행": "061",
+    "한국포스증권": "294",
+    "다올투자증권": "227",
+    "BNK투자증권": "224",
+    "카카오페이증권": "288",
+    "IBK투자증권": "225",
+    "토스증권": "271",
+    "토스뱅크": "092",
+    "상상인증권": "221"
+}
+
+
+# 은행명 표준화 함수
+def standardize_bank_name(bank_name):
+    bank_name = bank_name.lower().strip()
+    if "sc제일" in bank_name or "제일" in bank_name:
+        return "SC제일은행"
+    elif "제일은행" in bank_name:
+        return "SC제일은행"
+    elif "하나" in bank_name:
+        return "하나은행"
+    elif "경남" in bank_name:
+        return "경남은행"
+    elif "광주" in bank_name:
+        return "광주은행"
+    elif "국민" in bank_name:
+        return "국민은행"
+    elif "기업" in bank_name:
+        return "기업은행"
+    elif "농협은행" in bank_name:
+        return "농협"
+    elif "NH농협" in bank_name:
+        return "농협"
+    elif "nh농협" in bank_name:
+        return "농협"
+    elif "농협/" in bank_name:
+        return "농협"
+    elif "대구" in bank_name:         
+        return "iM뱅크(대구)"
+    elif "im뱅크" in bank_name:
+        return "iM뱅크(대구)"
+    elif "대구은행" in bank_name:
+        return "iM뱅크(대구)"
+    elif "부산" in bank_name:
+        return "부산은행"
+    elif "새마을" in bank_name:
+        return "새마을금고"
+    elif "수협" in bank_name:
+        return "수협은행"
+    elif "신한" in bank_name:
+        return "신한은행"
+    elif "우리" in bank_name:
+        return "우리은행"
+    elif "전북" in bank_name:
+        return "전북은행"
+    elif "제주" in bank_name:
+        return "제주은행"
+    elif "카카오" in bank_name:
+        return "카카오뱅크"
+    elif "카뱅" in bank_name:
+        return "카카오뱅크"
+    elif "씨티" in bank_name:
+        return "한국씨티은행"
+    elif "토스" in bank_name:
+        return "토스뱅크"
+    elif "카카오페이증권" in bank_name:
+        return "카카오페이증권"    
+    elif "미래에셋대우" in bank_name:
+        return "미래에셋증권"
+    elif "미래에셋" in bank_name:
+        return "미래에셋증권"
+       
+       
+    # 필요한 경우 추가 은행명 표준화
+    return bank_name
+
+
+# 전처리 함수
+def preprocess_account_info(account_info):
+    # 은행명과 계좌번호 분리
+    match = re.match(r'(\D+)\s*([\d\s\-]+)', account_info)
+    if match:
+        bank_name = standardize_bank_name(match.group(1).strip())
+        account_number = re.sub(r'[\s\-]', '', match.group(2))
+    else:
+        bank_name = ""
+        account_number = ""
+    
+    return bank_name, account_number
+
+
+def read_payout_rows(excel_path, sheet_name=0):
+    """엑셀 시트를 (은행, 계좌번호, 이름.제품명, 제품명, 금액) 행 목록으로 읽습니다."""
+    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    rows = []
+    for index, row in df.iterrows():
+        product_name = row.iloc[3]  # 제품명
+        customer_name = row.iloc[4]  # 이름
+        account_info = row.iloc[7]  # 은행+계좌번호
+        amount = row.iloc[9]  # 금액
+
+        # 계좌정보 전처리 (빈 칸은 검증에서 걸러지도록 빈 값으로 둔다)
+        if pd.isna(account_info):
+            bank_name, account_number = "", ""
+        else:
+            bank_name, account_number = preprocess_account_info(str(account_info))
+
+        # 항목 1 : 은행
+        # 항목 2 : 계좌번호
+        # 항목 3 : 이름.제품명
+        # 항목 4 : 제품명
+        name_product = "" if pd.isna(customer_name) else f"{customer_name}{product_name}"
+        rows.append((bank_name, account_number, name_product, product_name, amount))
+    return rows
+
+
+def validate_row(data, bank_options=BANK_OPTIONS):
+    """행 하나의 문제점 목록을 반환합니다. 문제가 없으면 빈 목록."""
+    bank, account_number, name_product, product_name, amount = data
+    problems = []
+    if bank not in bank_options:
+        problems.append(f"은행을 선택할 수 없음({bank or '빈 값'})")
+    if not account_number.isdigit():
+        problems.append(f"계좌번호 형식 오류({account_number or '빈 값'})")
+    if not name_product:
+        problems.append("이름 없음")
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        value = math.nan
+    if not math.isfinite(value) or value <= 0 or value != int(value):
+        problems.append(f"금액 오류({amount})")
+    return problems
+
+
+def prepare_payout_rows(excel_path, bank_options=BANK_OPTIONS, sheet_name=0):
+    """행을 읽고 검증해 (행 목록, [(행 번호, 이름.제품명, 문제점 목록)])을 반환합니다."""
+    rows = read_payout_rows(excel_path, sheet_name)
+    problems = []
+    for index, data in enumerate(rows):
+        row_problems = validate_row(data, bank_options)
+        if row_problems:
+            problems.append((index + 1, data[2], row_problems))
+    return rows, problems
+
+
+def print_payout_problems(problems):
+    for number, name_product, row_problems in problems:
+        print(f"⚠ {number}번째 행({name_product}): {', '.join(row_problems)}")
+
+
+def prefetch_payout_rows(excel_path, bank_options=BANK_OPTIONS, sheet_name=0):
+    """prepare_payout_rows를 백그라운드 스레드에서 시작하고 Future를 반환합니다.
+
+    검증 오류는 준비가 끝나는 즉시 출력되므로 로그인 중에도 확인할 수 있습니다.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payout")
+    future = executor.submit(prepare_payout_rows, excel_path, bank_options, sheet_name)
+    executor.shutdown(wait=False)
+
+    def report(done):
+        if done.exception() is not None:
+            print(f"⚠ 이체 정보 준비 실패: {done.exception()}")
+            return
+        rows, problems = done.result()
+        print(f"이체 정보 {len(rows)}건 준비 완료 (문제 있는 행 {len(problems)}건)")
+        print_payout_problems(problems)
+
+    future.add_done_callback(report)
+    return future
@@ -0,0 +1,83 @@
+"""MutationObserver로 팝업이 보이는 순간을 기다렸다가 등록된 처리 함수를 호출하는 디스패처"""
+import time
+
+# 등록된 선택자 중 하나가 보이게 되면 그 이름을, 시간 안에 나타나지 않으면 null을 돌려주는 비동기 스크립트
+POPUP_WATCH_SCRIPT = """
+var popups = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+function visible(el) {
+    if (!el || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function check() {
+    for (var i = 0; i < popups.length; i++) {
+        if (visible(document.querySelector(popups[i][1]))) { return popups[i][0]; }
+    }
+    return null;
+}
+var hit = check();
+if (hit) { done(hit); return; }
+var timer = null;
+var observer = new MutationObserver(function () {
+    var name = check();
+    if (name) { observer.disconnect(); clearTimeout(timer); done(name); }
+});
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class', 'hidden']
+});
+timer = setTimeout(function () { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+
+class PopupDispatcher:
+    """팝업 등록표 (이름 → CSS 선택자, 처리 함수)
+
+    처리 함수는 handler(driver, name)로 호출되며 반환값이 dispatch()의 결과가 됩니다.
+    """
+
+    def __init__(self, driver, budget=None):
+        self.driver = driver
+        self.budget = budget
+        self.popups = {}
+
+    def register(self, name, selector, handler):
+        self.popups[name] = (selector, handler)
+        return self
+
+    def wait(self, timeout):
+        """등록된 팝업 중 하나가 보일 때까지 기다려 이름을 반환합니다. 없으면 None."""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        table = [[name, selector] for name, (selector, _) in self.popups.items()]
+        deadline = time.monotonic() + timeout
+        # 드라이버 전체에 적용되는 설정이므로 끝나면 원래 값으로 되돌린다
+        previous_timeout = self.driver.timeouts.script
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                # 스크립트 자체 제한시간보다 드라이버 제한시간을 넉넉하게 둔다
+                self.driver.set_script_timeout(remaining + 5)
+                try:
+                    return self.driver.execute_async_script(POPUP_WATCH_SCRIPT, table, int(remaining * 1000))
+                except TimeoutException:
+                    return None
+                except WebDriverException as e:
+                    # 제출 후 화면이 바뀌면 관찰 중이던 문서가 사라지므로 새 문서에서 다시 관찰
+                    print(f"팝업 관찰 중 화면이 바뀌어 다시 관찰합니다: {e.msg}")
+                    time.sleep(0.05)
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+
+    def dispatch(self, timeout):
+        """팝업을 기다렸다가 해당 처리 함수를 호출하고 (이름, 처리 결과)를 반환합니다."""
+        if self.budget is None:
+            name = self.wait(timeout)
+        else:
+            with self.budget.waiting("popup"):
+                name = self.wait(timeout)
+        if name is None:
+            return None, None
+        _, handler = self.popups[name]
+        return name, handler(self.driver, name)
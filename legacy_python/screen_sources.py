@@ -0,0 +1,190 @@
+import glob
+import json
+import os
+
+import cv2
+import numpy as np
+
+
+class ScreenSource:
+    """화면 캡처 소스 인터페이스 (실제 화면, 녹화 프레임, 합성 화면)"""
+
+    def __init__(self, desktop):
+        # 모든 모니터를 포함하는 가상 데스크톱 영역
+        self.desktop = dict(desktop)
+        self.frame = None
+
+    def monitors(self):
+        """모니터 목록을 {'top', 'left', 'width', 'height', 'number'} 형식으로 반환합니다."""
+        raise NotImplementedError
+
+    def grab(self):
+        """가상 데스크톱 전체 프레임을 BGRA 배열로 반환합니다."""
+        raise NotImplementedError
+
+    def view(self, region, frame=None):
+        """캡처된 프레임에서 region 영역의 뷰(복사 없음)를 반환합니다."""
+        if frame is None:
+            frame = self.frame if self.frame is not None else self.grab()
+        x = region['left'] - self.desktop['left']
+        y = region['top'] - self.desktop['top']
+        return frame[y:y + region['height'], x:x + region['width']]
+
+    def grab_region(self, region):
+        """region 영역만 캡처해 BGRA 배열로 반환합니다."""
+        return self.view(region, self.grab())
+
+    def close(self):
+        pass
+
+
+def desktop_for(monitors):
+    """모니터 목록을 모두 포함하는 가상 데스크톱 영역을 계산합니다."""
+    left = min(m['left'] for m in monitors)
+    top = min(m['top'] for m in monitors)
+    right = max(m['left'] + m['width'] for m in monitors)
+    bottom = max(m['top'] + m['height'] for m in monitors)
+    return {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+
+
+def to_bgra(image):
+    """gray/BGR/BGRA 이미지를 BGRA로 맞춥니다."""
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+    if image.shape[2] == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+    return image
+
+
+class CaptureSession(ScreenSource):
+    """mss 컨텍스트를 유지하면서 전체 데스크톱을 한 번에 캡처하는 실제 화면 소스"""
+
+    def __init__(self):
+        import mss
+
+        self._sct = mss.mss()
+        # monitors[0]은 모든 모니터를 포함하는 가상 데스크톱
+        super().__init__(self._sct.monitors[0])
+
+    def monitors(self):
+        monitors = []
+        for i, monitor in enumerate(self._sct.monitors[1:], 1):  # monitors[0]은 전체 화면이므로 제외
+            monitors.append({
+                'top': monitor['top'],
+                'left': monitor['left'],
+                'width': monitor['width'],
+                'height': monitor['height'],
+                'number': i
+            })
+        return monitors
+
+    def grab(self):
+        screenshot = self._sct.grab(self.desktop)
+        # raw 버퍼를 복사 없이 numpy 배열로 감싼다
+        self.frame = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+        return self.frame
+
+    def grab_region(self, region):
+        screenshot = self._sct.grab(region)
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+
+    def close(self):
+        self._sct.close()
+
+
+class RecordedScreenSource(ScreenSource):
+    """녹화된 PNG/NPY 프레임 폴더를 순서대로 재생하는 화면 소스
+
+    폴더에 monitors.json(모니터 목록)이 있으면 그 배치를 사용하고,
+    없으면 프레임 전체를 모니터 1개로 취급합니다.
+    """
+
+    def __init__(self, directory, loop=True):
+        self.directory = directory
+        self.loop = loop
+        self.paths = sorted(
+            glob.glob(os.path.join(directory, "*.png")) + glob.glob(os.path.join(directory, "*.npy"))
+        )
+        if not self.paths:
+            raise ValueError(f"녹화 프레임을 찾을 수 없습니다: {directory}")
+        self.position = 0
+        self._cache = {}
+
+        layout_path = os.path.join(directory, "monitors.json")
+        if os.path.exists(layout_path):
+            with open(layout_path, 'r', encoding='utf-8') as f:
+                self._monitors = json.load(f)
+        else:
+            height, width = self._load(self.paths[0]).shape[:2]
+            self._monitors = [{'top': 0, 'left': 0, 'width': width, 'height': height, 'number': 1}]
+        super().__init__(desktop_for(self._monitors))
+
+    def monitors(self):
+        return [dict(monitor) for monitor in self._monitors]
+
+    def grab(self):
+        self.frame = self._load(self.paths[self.position])
+        if self.position < len(self.paths) - 1:
+            self.position += 1
+        elif self.loop:
+            self.position = 0
+        return self.frame
+
+    def _load(self, path):
+        frame = self._cache.get(path)
+        if frame is None:
+            if path.endswith(".npy"):
+                frame = np.load(path)
+            else:
+                frame = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+                if frame is None:
+                    raise ValueError(f"프레임을 읽을 수 없습니다: {path}")
+            frame = to_bgra(frame)
+            self._cache[path] = frame
+        return frame
+
+
+class SyntheticScreenSource(ScreenSource):
+    """배경 위에 템플릿 이미지를 알려진 위치에 붙여 만드는 합성 화면 소스"""
+
+    def __init__(self, monitors, background=None, seed=0):
+        self._monitors = [dict(monitor) for monitor in monitors]
+        super().__init__(desktop_for(self._monitors))
+        self.rng = np.random.default_rng(seed)
+        height, width = self.desktop['height'], self.desktop['width']
+        if background is None:
+            # 실제 화면처럼 부드러운 노이즈 배경
+            small = self.rng.integers(0, 256, (max(height // 16, 1), max(width // 16, 1), 3), dtype=np.uint8)
+            background = cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+        elif background.shape[:2] != (height, width):
+            background = cv2.resize(background, (width, height), interpolation=cv2.INTER_LINEAR)
+        self.background = to_bgra(background).copy()
+        self.frame = self.background.copy()
+        # 붙여 넣은 이미지의 정답 위치 목록
+        self.placements = []
+
+    def monitors(self):
+        return [dict(monitor) for monitor in self._monitors]
+
+    def paste(self, image, left, top, name=None):
+        """이미지를 데스크톱 좌표 (left, top)에 붙이고 중심 좌표를 반환합니다."""
+        image = to_bgra(image)
+        height, width = image.shape[:2]
+        x = left - self.desktop['left']
+        y = top - self.desktop['top']
+        self.frame[y:y + height, x:x + width] = image
+        center = (left + width // 2, top + height // 2)
+        self.placements.append({'name': name, 'left': left, 'top': top,
+                                'width': width, 'height': height, 'center': center})
+        return center
+
+    def clear(self):
+        self.frame = self.background.copy()
+        self.placements = []
+
+    def grab(self):
+        return self.frame
@@ -0,0 +1,119 @@
+"""10건이 넘는 이체 목록을 10건씩 나눠 차례로 입력/이체하는 배치 스케줄러"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from transfer_page import MAX_ROWS
+
+# 배치 상태: submitted(이체 완료), filled(입력만 완료), invalid(입력 불가), failed(오류),
+# unconfirmed(다계좌이체진행 버튼은 눌렀지만 결과를 확인하지 못함 - 이미 이체됐을 수 있음)
+SUBMITTED = "submitted"
+UNCONFIRMED = "unconfirmed"
+
+
+def split_batches(rows, size=MAX_ROWS):
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+def rows_signature(rows):
+    """같은 이체 목록인지 확인하기 위한 해시"""
+    data = json.dumps([[str(value) for value in row] for row in rows], ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class BatchProgress:
+    """배치별 진행 상황을 JSON 파일에 저장해 중단된 배치부터 이어서 진행할 수 있게 합니다."""
+
+    def __init__(self, path, rows, size=MAX_ROWS):
+        self.path = path
+        self.signature = rows_signature(rows)
+        self.total = len(split_batches(rows, size))
+        self.batches = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                # 이체 목록이 바뀌었으면 이전 진행 상황은 무시
+                if saved.get('signature') == self.signature:
+                    self.batches = saved.get('batches', {})
+            except (OSError, ValueError) as e:
+                print(f"진행 상황 파일을 읽을 수 없습니다: {e}")
+
+    def status(self, number):
+        return self.batches.get(str(number), {}).get('status')
+
+    def next_batch(self):
+        """아직 이체되지 않은 첫 배치 번호 (모두 끝났으면 None). unconfirmed 배치는 건너뛰지 않습니다."""
+        for number in range(self.total):
+            if self.status(number) != SUBMITTED:
+                return number
+        return None
+
+    def unconfirmed(self):
+        """버튼을 눌렀지만 결과를 확인하지 못한 배치 번호 목록"""
+        return [number for number in range(self.total) if self.status(number) == UNCONFIRMED]
+
+    def mark(self, number, status, names=None):
+        if names is None:
+            names = self.batches.get(str(number), {}).get('names')
+        self.batches[str(number)] = {
+            'status': status,
+            'names': names or [],
+            'time': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.save()
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'total': self.total, 'batches': self.batches},
+                      f, ensure_ascii=False, indent=2)
+
+
+def run_batches(rows, process, progress, start=None, size=MAX_ROWS, overrides=None):
+    """배치를 차례로 process(번호, 배치, 첫 배치 여부)에 넘기고 결과 상태를 기록합니다.
+
+    start를 주면 그 배치부터, 없으면 이체되지 않은 첫 배치부터 진행합니다.
+    배치가 submitted가 아니면 다음 배치로 넘어가지 않고 멈춥니다.
+    unconfirmed 배치가 있으면 두 번 이체되지 않도록 아무 배치도 진행하지 않습니다. 은행 이체내역을
+    확인한 뒤 overrides({배치 번호(0부터): 'submitted' 또는 'failed'})로 결과를 지정해야 다시 진행합니다.
+    """
+    batches = split_batches(rows, size)
+    for number, status in (overrides or {}).items():
+        print(f"[배치 {number + 1}/{len(batches)}] 상태를 '{status}'(으)로 지정합니다.")
+        progress.mark(number, status)
+    unconfirmed = progress.unconfirmed()
+    if unconfirmed:
+        for number in unconfirmed:
+            print(f"[배치 {number + 1}/{len(batches)}] 이체 버튼을 눌렀지만 결과를 확인하지 못했습니다. (배치 번호 {number})")
+        print("은행 이체내역에서 확인한 뒤 BATCH_OVERRIDES에 {배치 번호: 'submitted'(이체됨) 또는 'failed'(이체 안 됨)}를"
+              " 지정하고 다시 실행하세요.")
+        return progress
+    if start is None:
+        start = progress.next_batch()
+        if start is None:
+            print("모든 배치가 이미 이체되었습니다.")
+            return progress
+
+    first = True
+    for number in range(start, len(batches)):
+        batch = batches[number]
+        if progress.status(number) == SUBMITTED:
+            print(f"[배치 {number + 1}/{len(batches)}] 이미 이체되어 건너뜁니다.")
+            continue
+        print(f"\n[배치 {number + 1}/{len(batches)}] {len(batch)}건 진행")
+        try:
+            status = process(number, batch, first)
+        except Exception as e:
+            print(f"[배치 {number + 1}/{len(batches)}] 오류 발생: {e}")
+            status = "failed"
+        first = False
+        progress.mark(number, status, [str(data[2]) for data in batch])
+        if status == UNCONFIRMED:
+            print(f"[배치 {number + 1}/{len(batches)}] 이체 결과를 확인하지 못해 중단합니다. "
+                  f"은행 이체내역을 확인하기 전에는 이 배치를 다시 진행하지 않습니다.")
+            break
+        if status != SUBMITTED:
+            print(f"[배치 {number + 1}/{len(batches)}] 상태 '{status}'로 중단합니다. 다시 실행하면 이 배치부터 이어서 진행합니다.")
+            break
+    return progress
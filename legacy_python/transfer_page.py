@@ -0,0 +1,308 @@
+"""하나은행 다계좌이체 화면 조작 함수 모음 (3. 이체집행*.py에서 사용)"""
+import re
+
+# 다계좌이체 한 화면에 입력할 수 있는 최대 행 수
+MAX_ROWS = 10
+
+# 행별 입력 필드 ID 접두어 (실제 ID는 접두어 + 행 번호)
+BANK_FIELD = "rcvBnkCd"
+ACCOUNT_FIELD = "rcvAcctNo"
+AMOUNT_FIELD = "trnsAmt"
+NAME_PRODUCT_FIELD = "wdrwPsbkMarkCtt"
+PRODUCT_FIELD = "rcvPsbkMarkCtt"
+
+# 키보드 보안 때문에 실제 키 입력으로만 값이 반영되는 필드
+KEYSTROKE_FIELDS = (ACCOUNT_FIELD, AMOUNT_FIELD)
+
+# 은행 선택과 텍스트 필드를 한 번에 채우고 input/change 이벤트를 발생시키는 스크립트
+BULK_FILL_SCRIPT = """
+var rows = arguments[0];
+var results = [];
+function fire(el) {
+    ['input', 'change', 'blur'].forEach(function (type) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    });
+}
+for (var i = 0; i < rows.length; i++) {
+    var row = rows[i];
+    var result = {index: row.index, missing: [], invalid: []};
+    for (var id in row.fields) {
+        var el = document.getElementById(id + row.index);
+        if (!el) { result.missing.push(id); continue; }
+        var value = row.fields[id];
+        if (el.tagName === 'SELECT') {
+            var found = false;
+            // 빈 값(은행 코드를 모르는 경우)은 '선택' 옵션으로 되돌리지 않도록 잘못된 값으로 처리
+            for (var j = 0; j < el.options.length && value !== ''; j++) {
+                if (el.options[j].value === value) { found = true; break; }
+            }
+            if (!found) { result.invalid.push(id); continue; }
+        } else if (el.maxLength > 0) {
+            // 스크립트로 넣는 값은 maxlength가 적용되지 않으므로 키 입력과 같게 자른다
+            value = value.slice(0, el.maxLength);
+        }
+        el.value = value;
+        fire(el);
+    }
+    results.push(result);
+}
+return results;
+"""
+
+
+def row_fields(data, bank_options):
+    """전처리된 행 (은행, 계좌번호, 이름.제품명, 제품명, 금액)을 {필드 ID 접두어: 값}으로 바꿉니다."""
+    bank, account_number, name_product, product_name, amount = data
+    return {
+        BANK_FIELD: bank_options.get(bank, ""),
+        ACCOUNT_FIELD: str(account_number),
+        AMOUNT_FIELD: str(int(amount)),
+        NAME_PRODUCT_FIELD: str(name_product),
+        PRODUCT_FIELD: str(product_name),
+    }
+
+
+def bulk_fill(driver, batch, bank_options, keystroke_fields=KEYSTROKE_FIELDS, only=None):
+    """batch의 모든 행에서 키 입력이 필요 없는 필드를 한 번의 execute_script로 채웁니다.
+
+    only({행 번호: 필드 목록})를 주면 그 필드만 채웁니다.
+    행별 {'index', 'missing', 'invalid'} 결과 목록을 반환합니다.
+    """
+    rows = []
+    for index, data in enumerate(batch[:MAX_ROWS]):
+        fields = {
+            field: value
+            for field, value in row_fields(data, bank_options).items()
+            if field not in keystroke_fields and (only is None or field in only.get(index, ()))
+        }
+        rows.append({'index': index, 'fields': fields})
+    return driver.execute_script(BULK_FILL_SCRIPT, rows)
+
+# 하나은행 메뉴에서 다계좌이체 화면으로 가는 링크 (hanaMainframe 안)
+MULTI_TRANSFER_MENU = "다계좌이체"
+TRANSFER_MENU_XPATH = "//a[@title='이체' and text()='이체']"
+
+# 공백을 뺀 텍스트가 정확히 arguments[0]인 링크를 (보이는 것 우선) 실행하는 스크립트
+# 숨은 하위 메뉴 링크도 click()으로 메뉴의 onclick 처리기를 그대로 실행한다
+MENU_CLICK_SCRIPT = """
+var text = arguments[0], links = document.getElementsByTagName('a'), target = null, hidden = null;
+for (var i = 0; i < links.length; i++) {
+    if (links[i].textContent.replace(/\\s+/g, '') !== text) { continue; }
+    if (links[i].offsetWidth || links[i].offsetHeight) { target = links[i]; break; }
+    if (!hidden) { hidden = links[i]; }
+}
+target = target || hidden;
+if (!target) { return false; }
+target.scrollIntoView({block: 'center'});
+target.click();
+return true;
+"""
+
+
+def click_menu_link(driver, text=MULTI_TRANSFER_MENU):
+    """현재 문서에서 text 메뉴 링크를 실행합니다. 링크가 없으면 False."""
+    return driver.execute_script(MENU_CLICK_SCRIPT, text)
+
+
+def scroll_into_view(driver, element, block="center"):
+    """고정 스크롤 양 대신 요소가 화면 가운데 오도록 스크롤합니다."""
+    driver.execute_script("arguments[0].scrollIntoView({block: arguments[1]});", element, block)
+    return element
+
+# 입력 요소 전체와 계좌비밀번호, 다계좌이체진행 버튼, 은행 옵션 목록을 한 번에 찾는 스크립트
+RESOLVE_SCRIPT = """
+var fields = arguments[0], rowCount = arguments[1];
+var result = {rows: [], password: document.getElementById('paymAcctPw'), submit: null, bankOptions: []};
+for (var i = 0; i < rowCount; i++) {
+    var row = {};
+    fields.forEach(function (field) { row[field] = document.getElementById(field + i); });
+    result.rows.push(row);
+}
+var links = document.getElementsByTagName('a');
+for (var k = 0; k < links.length; k++) {
+    if (links[k].textContent.indexOf('다계좌이체진행') >= 0) { result.submit = links[k]; break; }
+}
+var bank = document.getElementById(fields[0] + '0');
+if (bank && bank.options) {
+    for (var j = 0; j < bank.options.length; j++) {
+        if (bank.options[j].value) { result.bankOptions.push(bank.options[j].value); }
+    }
+}
+return result;
+"""
+
+ROW_FIELDS = (BANK_FIELD, ACCOUNT_FIELD, AMOUNT_FIELD, NAME_PRODUCT_FIELD, PRODUCT_FIELD)
+
+# 모든 행의 현재 입력값을 한 번에 읽는 스크립트
+# (행마다 {필드 접두어: [값, maxlength, 암호화 값 유무]}, 요소가 없으면 null. cipher_ 필드가 없으면 유무는 null)
+READ_VALUES_SCRIPT = """
+var fields = arguments[0], rowCount = arguments[1], rows = [];
+for (var i = 0; i < rowCount; i++) {
+    var row = {};
+    fields.forEach(function (field) {
+        var el = document.getElementById(field + i);
+        var cipher = document.getElementById('cipher_' + field + i);
+        row[field] = el ? [el.value || '', el.maxLength > 0 ? el.maxLength : 0, cipher ? cipher.value !== '' : null] : null;
+    });
+    rows.push(row);
+}
+return rows;
+"""
+
+# 지정한 필드를 비우는 스크립트 (선택 목록은 첫 번째 '선택' 옵션으로 되돌림). TransKey 필드에는 쓰지 않음
+CLEAR_FIELDS_SCRIPT = """
+var targets = arguments[0];
+targets.forEach(function (target) {
+    var el = document.getElementById(target[0] + target[1]);
+    if (!el) { return; }
+    if (el.tagName === 'SELECT') { el.selectedIndex = 0; } else { el.value = ''; }
+    ['input', 'change'].forEach(function (type) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    });
+});
+"""
+
+# 행의 '취소' 버튼과 같은 처리(fncCancelPayment)로 지정한 행 전체를 초기화하는 스크립트
+# TransKey 필드의 숨은 cipher_ 값까지 화면이 직접 비운다. 처리 함수가 없으면 false
+ROW_RESET_SCRIPT = """
+var rows = arguments[0], form = document.forms['General01Form'];
+var page = window.pbk && pbk.transfer && pbk.transfer.manytransfer;
+if (!form || !page || typeof page.fncCancelPayment !== 'function') { return false; }
+// 초기화 확인 창이 뜨는 경우 자동으로 확인
+var confirm = window.confirm;
+window.confirm = function () { return true; };
+try {
+    rows.forEach(function (i) { page.fncCancelPayment(i, form); });
+} finally {
+    window.confirm = confirm;
+}
+return true;
+"""
+
+
+def fit_length(value, max_length):
+    """입력 칸의 maxlength에 맞게 자릅니다 (키 입력으로 넣을 때와 같은 결과)."""
+    return value[:max_length] if max_length else value
+
+
+def field_matches(field, current, expected, encrypted=None):
+    """화면 값이 입력하려는 값과 같은지 비교합니다. 키 입력 필드는 쉼표 서식만 허용합니다.
+
+    마스킹(****)되었거나 읽을 수 없는 값은 실제 값을 알 수 없으므로 다른 값으로 보고 다시 입력합니다.
+    encrypted는 TransKey 필드의 숨은 cipher_ 값 유무입니다. 비어 있어야 할 칸에 암호화 값이 남아 있거나
+    값이 보이는데 암호화 값이 없으면 다른 값으로 봅니다. 새 화면의 금액 칸은 '0'으로 시작합니다.
+    """
+    if current is None:
+        return False
+    if field in KEYSTROKE_FIELDS:
+        shown = re.sub(r"[,\s\-]", "", current)
+        expected = str(expected).strip()
+        if not expected:
+            return shown in ("", "0") and not encrypted
+        return shown == expected and encrypted is not False
+    return current.strip() == expected.strip()
+
+
+def reconcile_plan(driver, batch, bank_options, rows=MAX_ROWS):
+    """화면의 현재 값을 한 번에 읽어 batch와 다른 필드를 {행 번호: [필드 접두어]}로 반환합니다.
+
+    batch보다 뒤의 행에 남아 있는 값은 비워야 할 필드로 포함됩니다.
+    """
+    current = driver.execute_script(READ_VALUES_SCRIPT, list(ROW_FIELDS), rows)
+    plan = {}
+    for index, values in enumerate(current):
+        if index < len(batch):
+            expected = row_fields(batch[index], bank_options)
+        else:
+            expected = dict.fromkeys(ROW_FIELDS, "")
+        changed = []
+        for field in ROW_FIELDS:
+            current, max_length, encrypted = values[field] if values[field] is not None else (None, 0, None)
+            if not field_matches(field, current, fit_length(expected[field], max_length), encrypted):
+                changed.append(field)
+        if changed:
+            plan[index] = changed
+    return plan
+
+
+def clear_fields(driver, plan):
+    """plan({행 번호: [필드 접두어]})의 필드를 비우고, 실제로 다시 입력해야 할 plan을 반환합니다.
+
+    TransKey 필드(계좌번호, 금액)는 실제 값이 숨은 cipher_ 필드에 있어 스크립트로 비우면 이전 값이 남으므로,
+    그 필드가 포함된 행은 화면의 행 '취소'와 같은 처리로 행 전체를 초기화하고 모든 필드를 다시 입력합니다.
+    초기화 처리를 찾지 못하면 아무것도 바꾸지 않고 None을 반환합니다 (다계좌이체 화면을 새로 열어야 함).
+    """
+    reset = sorted(index for index, fields in plan.items() if any(field in KEYSTROKE_FIELDS for field in fields))
+    if reset and not driver.execute_script(ROW_RESET_SCRIPT, reset):
+        return None
+    targets = [[field, index] for index, fields in plan.items() if index not in reset for field in fields]
+    if targets:
+        driver.execute_script(CLEAR_FIELDS_SCRIPT, targets)
+    return {index: list(ROW_FIELDS) if index in reset else fields for index, fields in plan.items()}
+
+
+class MultiTransferPage:
+    """다계좌이체 화면의 입력 요소를 한 번의 스크립트로 찾아 보관하는 페이지 객체
+
+    페이지가 다시 그려져 요소가 stale 상태가 되면 자동으로 다시 찾습니다.
+    """
+
+    def __init__(self, driver, rows=MAX_ROWS):
+        self.driver = driver
+        self.row_count = rows
+        self.rows = []
+        self.password = None
+        self.submit = None
+        self.bank_options = set()
+        self.resolve()
+
+    def resolve(self):
+        """모든 행의 입력 요소, 계좌비밀번호, 제출 버튼을 한 번에 다시 찾습니다."""
+        result = self.driver.execute_script(RESOLVE_SCRIPT, list(ROW_FIELDS), self.row_count)
+        self.rows = result['rows']
+        self.password = result['password']
+        self.submit = result['submit']
+        self.bank_options = set(result['bankOptions'])
+        missing = [
+            f"{field}{index}"
+            for index, row in enumerate(self.rows)
+            for field in ROW_FIELDS
+            if row.get(field) is None
+        ]
+        if missing:
+            print(f"다계좌이체 화면에서 찾지 못한 요소: {missing}")
+        return self
+
+    def element(self, field, index):
+        return self.rows[index][field]
+
+    def run(self, action, field, index=None):
+        """요소에 action을 실행합니다. stale 요소면 다시 찾은 뒤 한 번 더 실행합니다.
+
+        field는 행 필드 접두어(예: ACCOUNT_FIELD)이거나 'password', 'submit'입니다.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        for attempt in range(2):
+            if field == 'password':
+                target = self.password
+            elif field == 'submit':
+                target = self.submit
+            else:
+                target = self.element(field, index)
+            try:
+                return action(target)
+            except StaleElementReferenceException:
+                if attempt == 1:
+                    raise
+                print("페이지가 다시 그려져 입력 요소를 다시 찾습니다.")
+                self.resolve()
+
+    def invalid_banks(self, batch, bank_options):
+        """은행 코드가 없거나 화면의 선택 목록에 없는 행을 (행 번호, 은행명) 목록으로 반환합니다."""
+        invalid = []
+        for index, data in enumerate(batch[:self.row_count]):
+            code = bank_options.get(data[0], "")
+            if not code or (self.bank_options and code not in self.bank_options):
+                invalid.append((index, data[0]))
+        return invalid
@@ -0,0 +1,171 @@
+"""다계좌이체 결과 화면을 저장하고 행별 성공/실패를 기록하는 함수 모음
+
+3. 이체집행*.py가 결과를 transfer_outcomes.jsonl에 기록하고,
+4. 이체내역백업 및 완료입력.py가 성공한 행만 입금완료로 바꿀 때 읽습니다.
+"""
+import json
+import os
+import re
+from datetime import datetime
+
+# 결과 표가 나타났는지 확인할 때 쓰는 XPath (머리글에 '결과'가 들어간 표)
+RESULT_HEADER_XPATH = "//table[.//th[contains(normalize-space(.), '결과')]]"
+
+# 머리글에 이 단어가 들어간 열을 찾음 (앞쪽 단어 우선)
+ACCOUNT_HEADERS = ("입금계좌", "받는계좌", "계좌번호", "계좌")
+AMOUNT_HEADERS = ("이체금액", "금액")
+RESULT_HEADERS = ("처리결과", "이체결과", "결과", "상태")
+MESSAGE_HEADERS = ("사유", "메시지", "오류내용", "비고")
+NAME_HEADERS = ("받는분", "예금주", "수취인")
+
+SUCCESS_WORDS = ("정상", "완료", "성공")
+FAILURE_WORDS = ("실패", "오류", "불능", "불가", "취소", "거절", "미처리")
+
+SUCCESS = "success"
+FAILED = "failed"
+UNKNOWN = "unknown"
+
+
+def digits(text):
+    return re.sub(r"\D", "", str(text))
+
+
+def save_result_snapshot(html, directory, label):
+    """결과 화면 HTML을 directory에 저장하고 파일 경로를 반환합니다 (html파싱.py와 같은 방식)."""
+    os.makedirs(directory, exist_ok=True)
+    filename = f"transfer_result_{datetime.now():%Y%m%d_%H%M%S}_{label}.html"
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(html)
+    print(f"이체 결과 화면이 {path}에 저장되었습니다.")
+    return path
+
+
+def find_column(headers, candidates, exclude=()):
+    for candidate in candidates:
+        for index, header in enumerate(headers):
+            if candidate in header and not any(word in header for word in exclude):
+                return index
+    return None
+
+
+def is_success(result_text):
+    if any(word in result_text for word in FAILURE_WORDS):
+        return False
+    return any(word in result_text for word in SUCCESS_WORDS)
+
+
+def parse_result_rows(html):
+    """결과 표의 행을 {'account', 'amount', 'name', 'result', 'message', 'success'} 목록으로 읽습니다.
+
+    계좌 열과 결과 열이 모두 있는 표만 결과 표로 봅니다.
+    """
+    from lxml import html as lxml_html
+
+    document = lxml_html.fromstring(html)
+    rows = []
+    for table in document.iter("table"):
+        header_cells = table.xpath(".//thead//th") or table.xpath(".//tr[th][1]/th")
+        headers = [re.sub(r"\s+", "", cell.text_content()) for cell in header_cells]
+        # 출금계좌 열은 받는 계좌가 아님
+        account_col = find_column(headers, ACCOUNT_HEADERS, exclude=("출금",))
+        result_col = find_column(headers, RESULT_HEADERS)
+        if account_col is None or result_col is None:
+            continue
+        amount_col = find_column(headers, AMOUNT_HEADERS, exclude=("수수료",))
+        message_col = find_column(headers, MESSAGE_HEADERS)
+        name_col = find_column(headers, NAME_HEADERS)
+
+        for tr in table.xpath(".//tr[td]"):
+            cells = [" ".join(cell.text_content().split()) for cell in tr.xpath("./td")]
+            if len(cells) <= max(account_col, result_col):
+                continue
+
+            def cell(col):
+                return cells[col] if col is not None and col < len(cells) else ""
+
+            rows.append({
+                'account': cell(account_col),
+                'amount': int(digits(cell(amount_col)) or 0),
+                'name': cell(name_col),
+                'result': cell(result_col),
+                'message': cell(message_col),
+                'success': is_success(cell(result_col)),
+            })
+    return rows
+
+
+def account_matches(shown, account):
+    """화면의 계좌번호(일부가 *로 가려질 수 있음)가 account와 같은지 확인합니다."""
+    shown = re.sub(r"[\s\-]", "", shown)
+    account = digits(account)
+    if len(shown) != len(account):
+        return False
+    return all(s == a or s == "*" for s, a in zip(shown, account))
+
+
+def match_outcomes(batch, parsed, snapshot=None, batch_number=None):
+    """입력한 행마다 결과 표의 행을 찾아 행별 결과 기록 목록을 만듭니다. 못 찾으면 unknown."""
+    created = datetime.now().isoformat(timespec='seconds')
+    unused = list(parsed)
+    outcomes = []
+    for index, (bank, account_number, name_product, product_name, amount) in enumerate(batch):
+        found = None
+        for row in unused:
+            if account_matches(row['account'], account_number) and (not row['amount'] or row['amount'] == int(amount)):
+                found = row
+                break
+        if found is not None:
+            unused.remove(found)
+        outcomes.append({
+            'created': created,
+            'batch': batch_number,
+            'row': index + 1,
+            'bank': bank,
+            'account': str(account_number),
+            'name_product': name_product,
+            'product_name': str(product_name),
+            'amount': int(amount),
+            'status': UNKNOWN if found is None else (SUCCESS if found['success'] else FAILED),
+            'result': found['result'] if found else "",
+            'message': found['message'] if found else "결과 표에서 찾지 못함",
+            'snapshot': snapshot,
+        })
+    return outcomes
+
+
+def write_outcomes(path, outcomes):
+    with open(path, 'a', encoding='utf-8') as f:
+        for outcome in outcomes:
+            f.write(json.dumps(outcome, ensure_ascii=False) + "\n")
+
+
+def load_outcomes(path, day=None):
+    """day(YYYY-MM-DD, 기본 오늘)에 기록된 결과 목록. 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    day = day or datetime.now().strftime("%Y-%m-%d")
+    outcomes = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                outcome = json.loads(line)
+                if outcome['created'].startswith(day):
+                    outcomes.append(outcome)
+    return outcomes
+
+
+def row_matches_outcome(cells, outcome):
+    """시트 행의 셀 중에 결과의 계좌번호와 금액이 모두 있는지 확인합니다."""
+    cell_digits = [digits(cell) for cell in cells]
+    return outcome['account'] in cell_digits and str(outcome['amount']) in cell_digits
+
+
+def take_outcome(outcomes, cells):
+    """시트 행과 맞는 결과를 꺼내 반환합니다 (성공 기록 우선). 같은 결과는 한 행에만 쓰입니다."""
+    for wanted in (SUCCESS, None):
+        for outcome in outcomes:
+            if (wanted is None or outcome['status'] == wanted) and row_matches_outcome(cells, outcome):
+                outcomes.remove(outcome)
+                return outcome
+    return None